@@ -0,0 +1,182 @@
+import numpy as np
+from typing import TYPE_CHECKING, Optional, Sequence
+from CombatSimulator import CLASS_MAP
+from entity.EnemyFactory import EnemyFactory
+
+if TYPE_CHECKING:
+    from entity.Character import Character
+    from entity.EnemyFactory import Enemy
+
+PLAYER_CLASSES = ("Warrior", "Mage", "Thief")
+ENEMY_TYPES = ("Wolf", "Bandit", "Skeleton", "Corrupted Champion", "Boss")
+
+# Multiplicateur de force du skill1 des ennemis (0 = skill sans effet)
+SKILL_MULTIPLIERS = {"Corrupted Champion": 1.5, "Boss": 2.0}
+
+# Bornes de enemy_turn : attaque < 0.7, défense < 0.85, skill sinon
+ENEMY_ATTACK_CHANCE = 0.7
+ENEMY_DEFEND_CHANCE = 0.85
+
+
+def playerStats(character: "Character") -> dict:
+    return {
+        'hp': character.hp,
+        'strength': character.getEffectiveStat('strength'),
+        'defense': character.getEffectiveStat('defense'),
+        'base_defense': character.defense,
+        'critChance': getattr(character, 'critChance', 0)
+    }
+
+
+def enemyStats(enemy: "Enemy") -> dict:
+    return {
+        'hp': enemy.hp,
+        'strength': enemy.strength,
+        'defense': enemy.defense,
+        'skill_multiplier': SKILL_MULTIPLIERS.get(enemy.name, 0.0),
+        'min_attacks': enemy.minNumberOfAttacks,
+        'max_attacks': enemy.maxNumberOfAttacks
+    }
+
+
+def _column(stats: Sequence[dict], key: str, repeat: int) -> np.ndarray:
+    return np.repeat(np.array([s[key] for s in stats], dtype=np.float64), repeat)
+
+
+def resolve_fights(players: Sequence[dict], enemies: Sequence[dict], fights: int,
+                   rng: np.random.Generator, max_turns: int = 200, multi_attack: bool = False):
+    """Resolves `fights` always-attack fights for each (players[i], enemies[i]) cell at once.
+
+    Follows CombatSystem turn by turn: the player attacks with AttackAction rules
+    (±10% variance, critChance roll, x1.5 on crit, x1.5 enemy defense after the
+    enemy defended), then the enemy attacks (70%), defends (15%) or uses skill1 (15%).
+    CombatSystem resolves every enemy attack as a single AttackAction; set
+    multi_attack to repeat it Wolf-style between min and max number of attacks.
+
+    Returns (won, turns) arrays of shape (cells, fights). Fights still running
+    after max_turns are neither won nor lost and report max_turns + 1.
+    """
+    cells = len(players)
+    size = cells * fights
+
+    p_hp = _column(players, 'hp', fights)
+    p_str = _column(players, 'strength', fights)
+    p_def = _column(players, 'defense', fights)
+    p_base_def = _column(players, 'base_defense', fights)
+    p_crit = _column(players, 'critChance', fights) / 100
+    e_hp = _column(enemies, 'hp', fights)
+    e_str = _column(enemies, 'strength', fights)
+    e_def = _column(enemies, 'defense', fights)
+    e_skill = _column(enemies, 'skill_multiplier', fights)
+    e_min_attacks = _column(enemies, 'min_attacks', fights).astype(np.int64)
+    e_max_attacks = _column(enemies, 'max_attacks', fights).astype(np.int64)
+
+    e_defending = np.zeros(size, dtype=bool)
+    won = np.zeros(size, dtype=bool)
+    turns = np.full(size, max_turns + 1, dtype=np.int64)
+    active = np.arange(size)
+
+    for turn in range(1, max_turns + 1):
+        if not active.size:
+            break
+
+        # Tour du joueur
+        defense = e_def[active]
+        defense = np.where(e_defending[active], np.trunc(defense * 1.5), defense)
+        damage = np.trunc(np.maximum(0, p_str[active] - defense) * rng.uniform(0.9, 1.1, active.size))
+        crit = rng.random(active.size) < p_crit[active]
+        damage = np.where(crit, np.trunc(damage * 1.5), damage)
+        e_hp[active] -= damage
+
+        dead = e_hp[active] <= 0
+        won[active[dead]] = True
+        turns[active[dead]] = turn
+        active = active[~dead]
+        if not active.size:
+            break
+
+        # Tour de l'ennemi
+        roll = rng.random(active.size)
+        attack = roll < ENEMY_ATTACK_CHANCE
+        defend = ~attack & (roll < ENEMY_DEFEND_CHANCE)
+        skill = ~attack & ~defend
+        e_defending[active] = defend
+
+        hits = np.where(attack, 1, 0)
+        if multi_attack:
+            hits = np.where(attack, rng.integers(e_min_attacks[active], e_max_attacks[active] + 1), 0)
+
+        base_damage = np.maximum(0, e_str[active] - p_def[active])
+        damage = np.zeros(active.size)
+        for hit in range(1, int(hits.max(initial=0)) + 1):
+            striking = hits >= hit
+            variance = rng.uniform(0.9, 1.1, active.size)
+            damage += np.where(striking, np.trunc(base_damage * variance), 0)
+
+        damage += np.where(skill, np.maximum(0, e_str[active] * e_skill[active] - p_base_def[active]), 0)
+        p_hp[active] -= damage
+
+        dead = p_hp[active] <= 0
+        turns[active[dead]] = turn
+        active = active[~dead]
+
+    return won.reshape(cells, fights), turns.reshape(cells, fights)
+
+
+def simulate(player: "Character", enemy: "Enemy", fights: int = 10000, seed: Optional[int] = None,
+             max_turns: int = 200, multi_attack: bool = False) -> dict:
+    """Monte Carlo win probability and turn distribution for one player/enemy pair."""
+    rng = np.random.default_rng(seed)
+    won, turns = resolve_fights([playerStats(player)], [enemyStats(enemy)], fights, rng, max_turns, multi_attack)
+    return {
+        'win_prob': float(won.mean()),
+        'turn_distribution': np.bincount(turns[0], minlength=max_turns + 2) / fights
+    }
+
+
+def win_rate_table(player_classes: Sequence[str] = PLAYER_CLASSES, player_levels: Sequence[int] = range(1, 31),
+                   enemy_types: Sequence[str] = ENEMY_TYPES, enemy_levels: Optional[Sequence[int]] = None,
+                   fights: int = 1000, seed: Optional[int] = None, max_turns: int = 200,
+                   multi_attack: bool = False, cells_per_chunk: int = 512) -> dict:
+    """Fills the (class, level, enemy, enemy level) matrix of win rates.
+
+    'win_prob' has shape (classes, levels, enemies, enemy levels) and
+    'turn_distribution' adds a last axis indexed by turn count, where index
+    max_turns + 1 collects the fights that hit the turn limit.
+    """
+    player_levels = list(player_levels)
+    enemy_levels = list(enemy_levels) if enemy_levels is not None else player_levels
+    rng = np.random.default_rng(seed)
+    factory = EnemyFactory()
+
+    players = []
+    for player_class in player_classes:
+        for level in player_levels:
+            character = CLASS_MAP[player_class](player_class)
+            character.level = level
+            players.append(playerStats(character))
+    enemies = [enemyStats(factory.create_enemy(enemy_type, level))
+               for enemy_type in enemy_types for level in enemy_levels]
+
+    pairs = [(p, e) for p in players for e in enemies]
+    win_prob = np.empty(len(pairs))
+    turn_distribution = np.empty((len(pairs), max_turns + 2))
+
+    for start in range(0, len(pairs), cells_per_chunk):
+        chunk = pairs[start:start + cells_per_chunk]
+        won, turns = resolve_fights([p for p, _ in chunk], [e for _, e in chunk], fights, rng, max_turns, multi_attack)
+        win_prob[start:start + len(chunk)] = won.mean(axis=1)
+
+        offsets = turns + (np.arange(len(chunk)) * (max_turns + 2))[:, None]
+        counts = np.bincount(offsets.ravel(), minlength=len(chunk) * (max_turns + 2))
+        turn_distribution[start:start + len(chunk)] = counts.reshape(len(chunk), max_turns + 2) / fights
+
+    shape = (len(player_classes), len(player_levels), len(enemy_types), len(enemy_levels))
+    return {
+        'player_classes': list(player_classes),
+        'player_levels': player_levels,
+        'enemy_types': list(enemy_types),
+        'enemy_levels': enemy_levels,
+        'win_prob': win_prob.reshape(shape),
+        'turn_distribution': turn_distribution.reshape(shape + (max_turns + 2,))
+    }
@@ -0,0 +1,185 @@
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Callable, List, Optional
+from CombatStrategy import CombatSystem, CombatAction, AttackAction, UseItemAction
+from entity.Character import Character, Warrior, Mage, Thief
+from entity.EnemyFactory import POOL_SIZE, EnemyFactory
+from item.ItemFactory import getItemFactory
+from RngStream import RngStream
+from Renderer import NullSink, useSink, flush
+
+if TYPE_CHECKING:
+    from entity.EnemyFactory import Enemy
+
+CLASS_MAP = {"Warrior": Warrior, "Mage": Mage, "Thief": Thief}
+
+
+def attackPolicy(combat: "HeadlessCombatSystem") -> CombatAction:
+    """Always attacks."""
+    return AttackAction(combat.rng)
+
+
+class HealingPolicy:
+    """Drinks a healing potion below the hp threshold, attacks otherwise."""
+
+    def __init__(self, threshold: float = 0.3):
+        self.threshold = threshold
+
+    def __call__(self, combat: "HeadlessCombatSystem") -> CombatAction:
+        player = combat.player
+        if player.hp < player.hpMax * self.threshold:
+            for consumable in player.inventory.getConsumables():
+                if "hp" in consumable.affected_stats:
+                    return UseItemAction(consumable)
+        return AttackAction(combat.rng)
+
+
+class HeadlessCombatSystem(CombatSystem):
+    """CombatSystem driven by a policy instead of stdin, with all output discarded.
+
+    The policy is a callable receiving the combat and returning the CombatAction
+    the player performs this turn, or None to give up the fight.
+    """
+
+    def __init__(self, player: "Character", enemy: "Enemy", policy: Callable = attackPolicy, max_turns: int = 200,
+                 rng: random.Random = random):
+        super().__init__(player, enemy, rng)
+        self.policy = policy
+        self.max_turns = max_turns
+        self.damage_dealt = 0
+        self.damage_taken = 0
+        self.items_used = []
+
+    def player_turn(self) -> bool:
+        self.combat_state['player_is_defending'] = False
+
+        action = self.policy(self)
+        if action is None:
+            return False
+
+        enemy_hp = self.enemy.hp
+        result = self.perform_player_action(action)
+        self.damage_dealt += max(0, enemy_hp - self.enemy.hp)
+
+        if result.get('item_used'):
+            self.items_used.append(action.item.name)
+        return True
+
+    def enemy_turn(self):
+        player_hp = self.player.hp
+        super().enemy_turn()
+        self.damage_taken += max(0, player_hp - self.player.hp)
+
+    def run(self) -> dict:
+        winner = None
+        xp = self.player.xp
+
+        with useSink(NullSink()):
+            while self.player.hp > 0 and self.enemy.hp > 0 and self.turn_count < self.max_turns:
+                self.turn_count += 1
+
+                if not self.player_turn():
+                    winner = "enemy"
+                    break
+
+                if self.enemy.hp <= 0:
+                    self.victory()
+                    winner = "player"
+                    break
+
+                self.enemy_turn()
+
+                if self.player.hp <= 0:
+                    self.defeat()
+                    winner = "enemy"
+                    break
+
+        return {
+            'winner': winner,
+            'turns': self.turn_count,
+            'damage_dealt': self.damage_dealt,
+            'damage_taken': self.damage_taken,
+            'items_used': self.items_used,
+            'xp_gained': self.player.xp - xp,
+            'player_hp': max(0, self.player.hp),
+            'enemy_hp': max(0, self.enemy.hp)
+        }
+
+
+def _potions(count: int) -> list:
+    with useSink(NullSink()):
+        item_factory = getItemFactory()
+    return [item_factory.createConsumable("Potion de soin") for _ in range(count)]
+
+
+def run_fight(player_class: str, player_level: int, enemy_type: str, enemy_level: int,
+              policy: Callable = attackPolicy, potions: int = 0, max_turns: int = 200,
+              rng: random.Random = random, enemy_factory: EnemyFactory = None) -> dict:
+    """Builds a fresh character and enemy and resolves one headless fight.
+
+    The enemy comes from (and goes back to) enemy_factory, so a factory with
+    a pool recycles enemies from one fight to the next.
+    """
+    player = CLASS_MAP[player_class](player_class)
+    player.level = player_level
+    with useSink(NullSink()):
+        for potion in _potions(potions):
+            player.inventory.addItem(potion)
+
+    enemy_factory = enemy_factory or EnemyFactory()
+    enemy = enemy_factory.create_enemy(enemy_type, enemy_level, rng)
+    outcome = HeadlessCombatSystem(player, enemy, policy, max_turns, rng).run()
+    enemy_factory.release(enemy)
+    return outcome
+
+
+def _run_chunk(count: int, seed: int, *args) -> List[dict]:
+    rng = RngStream(seed)
+    # Les combats d'un chunk recyclent leurs ennemis
+    enemy_factory = EnemyFactory(pool_size=POOL_SIZE)
+    return [run_fight(*args, rng=rng, enemy_factory=enemy_factory) for _ in range(count)]
+
+
+def run_batch(player_class: str, player_level: int, enemy_type: str, enemy_level: int, fights: int,
+              policy: Callable = attackPolicy, potions: int = 0, max_turns: int = 200,
+              workers: Optional[int] = None, chunk_size: int = 500, seed: Optional[int] = None) -> List[dict]:
+    """Runs `fights` independent headless fights spread over a process pool.
+
+    The policy must be picklable (a module level function or a class instance
+    such as HealingPolicy) since it is shipped to the worker processes. Each
+    chunk draws from its own stream seeded from `seed`, so a seeded batch
+    gives the same outcomes whatever the number of workers.
+    """
+    args = (player_class, player_level, enemy_type, enemy_level, policy, potions, max_turns)
+    chunks = [chunk_size] * (fights // chunk_size)
+    if fights % chunk_size:
+        chunks.append(fights % chunk_size)
+    rng = RngStream(seed)
+    seeds = [rng.getrandbits(63) for _ in chunks]
+
+    # Forked workers inherit the pending terminal buffer, empty it first
+    flush()
+    outcomes = []
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        for chunk in executor.map(_run_chunk, chunks, seeds, *[[arg] * len(chunks) for arg in args]):
+            outcomes.extend(chunk)
+    return outcomes
+
+
+def summarize(outcomes: List[dict]) -> dict:
+    fights = len(outcomes)
+    if not fights:
+        return {'fights': 0}
+
+    wins = sum(1 for outcome in outcomes if outcome['winner'] == "player")
+    unresolved = sum(1 for outcome in outcomes if outcome['winner'] is None)
+    return {
+        'fights': fights,
+        'win_rate': wins / fights,
+        'unresolved': unresolved,
+        'avg_turns': sum(outcome['turns'] for outcome in outcomes) / fights,
+        'avg_damage_dealt': sum(outcome['damage_dealt'] for outcome in outcomes) / fights,
+        'avg_damage_taken': sum(outcome['damage_taken'] for outcome in outcomes) / fights,
+        'avg_items_used': sum(len(outcome['items_used']) for outcome in outcomes) / fights
+    }
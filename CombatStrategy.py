@@ -1,6 +1,7 @@
 import random
 from typing import TYPE_CHECKING
 from Utils import inputMenu
+from Renderer import write, render, isEnabled
 
 if TYPE_CHECKING:
     from entity.Character import Character
@@ -14,8 +15,9 @@ class CombatAction:
         pass
 
 class AttackAction(CombatAction):
-    def __init__(self):
+    def __init__(self, rng: random.Random = random):
         super().__init__("Attack")
+        self.rng = rng
     
     def execute(self, attacker, defender, combat_state) -> dict:
         if hasattr(attacker, 'getEffectiveStat'):
@@ -34,17 +36,17 @@ class AttackAction(CombatAction):
         
         # Calcul des dégâts avec variance aléatoire (±10%)
         base_damage = max(0, attack_stat - defense_stat)
-        variance = random.uniform(0.9, 1.1)
+        variance = self.rng.uniform(0.9, 1.1)
         damage = int(base_damage * variance)
         
         crit_chance = getattr(attacker, 'critChance', 0)
-        is_crit = random.random() < (crit_chance / 100)
+        is_crit = self.rng.random() < (crit_chance / 100)
         
         if is_crit:
             damage = int(damage * 1.5)
-            result_text = f"CRITICAL HIT ! {attacker.name} deals {damage} damage to {defender.name}!"
+            result_text = render("CRITICAL HIT ! {} deals {} damage to {}!", attacker.name, damage, defender.name)
         else:
-            result_text = f"{attacker.name} deals {damage} damage to {defender.name}!"
+            result_text = render("{} deals {} damage to {}!", attacker.name, damage, defender.name)
         
         defender.hp -= damage
         
@@ -61,7 +63,7 @@ class DefendAction(CombatAction):
     
     def execute(self, attacker, defender, combat_state) -> dict:
         combat_state['attacker_is_defending'] = True
-        result_text = f"{attacker.name} takes a defensive stance! Defense increased for the next turn."
+        result_text = render("{} takes a defensive stance! Defense increased for the next turn.", attacker.name)
         
         return {
             'damage': 0,
@@ -90,7 +92,7 @@ class UseItemAction(CombatAction):
             if "damage" in self.item.affected_stats:
                 damage = self.item.value
                 defender.hp -= damage
-                result_text = f"{attacker.name} uses {self.item.name}! {defender.name} takes {damage} damage!"
+                result_text = render("{} uses {}! {} takes {} damage!", attacker.name, self.item.name, defender.name, damage)
                 self.item.is_used = True
                 return {
                     'damage': damage,
@@ -102,7 +104,7 @@ class UseItemAction(CombatAction):
                 old_hp = attacker.hp
                 attacker.hp = min(attacker.hp + self.item.value, attacker.hpMax)
                 healed = attacker.hp - old_hp
-                result_text = f"{attacker.name} uses {self.item.name} and recovers {healed} HP! (HP: {attacker.hp}/{attacker.hpMax})"
+                result_text = render("{} uses {} and recovers {} HP! (HP: {}/{})", attacker.name, self.item.name, healed, attacker.hp, attacker.hpMax)
                 self.item.is_used = True
                 return {
                     'damage': 0,
@@ -112,7 +114,7 @@ class UseItemAction(CombatAction):
                     'item_used': True
                 }
             else:
-                result_text = f"{attacker.name} uses {self.item.name}!"
+                result_text = render("{} uses {}!", attacker.name, self.item.name)
                 self.item.is_used = True
                 return {
                     'damage': 0,
@@ -121,9 +123,10 @@ class UseItemAction(CombatAction):
                 }
 
 class CombatSystem:    
-    def __init__(self, player: "Character", enemy: "Enemy"):
+    def __init__(self, player: "Character", enemy: "Enemy", rng: random.Random = random):
         self.player = player
         self.enemy = enemy
+        self.rng = rng
         self.turn_count = 0
         self.combat_state = {
             'player_is_defending': False,
@@ -132,47 +135,67 @@ class CombatSystem:
         self.combat_log = []
     
     def start_combat(self) -> bool:
-        print("\n" + "="*60)
-        print(f"FIGHT VS {self.enemy.name.upper()} (Level {self.enemy.level})")
-        print("="*60)
+        self.display_header()
         
         while self.player.hp > 0 and self.enemy.hp > 0:
-            self.turn_count += 1
-            self.display_combat_status()
+            self.next_turn()
             
             if not self.player_turn():
                 return False
             
-            if self.enemy.hp <= 0:
-                self.victory()
-                return True
-            
-            self.enemy_turn()
-            
-            if self.player.hp <= 0:
-                self.defeat()
-                return False
+            outcome = self.finish_turn()
+            if outcome is not None:
+                return outcome
         
         return False
     
+    def display_header(self):
+        write("\n" + "="*60)
+        write("FIGHT VS {} (Level {})", self.enemy.name.upper(), self.enemy.level)
+        write("="*60)
+    
+    def next_turn(self):
+        self.turn_count += 1
+        self.display_combat_status()
+        self.reset_player_stance()
+    
+    def finish_turn(self):
+        """Ends the turn once the player has acted: True on victory, False on defeat, None if the fight goes on."""
+        if self.enemy.hp <= 0:
+            self.victory()
+            return True
+        
+        self.enemy_turn()
+        
+        if self.player.hp <= 0:
+            self.defeat()
+            return False
+        return None
+    
     def display_combat_status(self):
-        print(f"\n--- Turn {self.turn_count} ---")
-        print(f"{self.player.name}: {self.player.hp}/{self.player.hpMax} HP")
-        print(f"{self.enemy.name}: {self.enemy.hp}/{self.enemy.hpMax} HP")
+        if not isEnabled():
+            return
+        
+        write("\n--- Turn {} ---", self.turn_count)
+        write("{}: {}/{} HP", self.player.name, self.player.hp, self.player.hpMax)
+        write("{}: {}/{} HP", self.enemy.name, self.enemy.hp, self.enemy.hpMax)
         
         if self.combat_state.get('player_is_defending'):
-            print(f"{self.player.name} is in a defensive stance")
+            write("{} is in a defensive stance", self.player.name)
         if self.combat_state.get('enemy_is_defending'):
-            print(f"{self.enemy.name} is in a defensive stance")
-        print()
+            write("{} is in a defensive stance", self.enemy.name)
+        write("")
     
-    def player_turn(self) -> bool:
+    def reset_player_stance(self):
         # Reset the defending state from the previous turn
         defending_last_turn = self.combat_state.get('player_is_defending', False)
         self.combat_state['player_is_defending'] = False
         
         if defending_last_turn:
-            print(f"{self.player.name} returns to an offensive stance.\n")
+            write("{} returns to an offensive stance.\n", self.player.name)
+    
+    def player_turn(self) -> bool:
+        self.reset_player_stance()
         
         actions = [
             "Attack",
@@ -184,10 +207,7 @@ class CombatSystem:
         choice = inputMenu(f"What do you want to do?", actions)
         
         if choice == 1:
-            action = AttackAction()
-            result = action.execute(self.player, self.enemy, self.combat_state)
-            print(f"\n{result['text']}")
-            print(f"{self.enemy.name}: {result['defender_hp']}/{self.enemy.hpMax} HP")
+            self.perform_player_action(AttackAction(self.rng))
         
         elif choice == 2:
             return self.use_skill()
@@ -196,21 +216,31 @@ class CombatSystem:
             return self.use_item()
         
         elif choice == 4:
-            action = DefendAction()
-            result = action.execute(self.player, self.enemy, self.combat_state)
-            print(f"\n{result['text']}")
+            self.perform_player_action(DefendAction())
         
         return True
     
+    def perform_player_action(self, action: CombatAction) -> dict:
+        result = action.execute(self.player, self.enemy, self.combat_state)
+        write("\n{}", result['text'])
+        
+        if isinstance(action, AttackAction):
+            write("{}: {}/{} HP", self.enemy.name, result['defender_hp'], self.enemy.hpMax)
+        
+        if result.get('item_used'):
+            self.player.inventory.consumeItem(action.item)
+        
+        return result
+    
     def use_skill(self) -> bool:
-        print("No skills not implemented!")
+        write("No skills not implemented!")
         return self.player_turn()
         
     def use_item(self) -> bool:      
         consumables = self.player.inventory.getConsumables()
         
         if not consumables:
-            print("No consumables available!")
+            write("No consumables available!")
             return self.player_turn()
         
         labels = [consumable.getDescription() for consumable in consumables]
@@ -222,13 +252,7 @@ class CombatSystem:
             return self.player_turn()
         
         item = consumables[choice - 1]
-        action = UseItemAction(item)
-        result = action.execute(self.player, self.enemy, self.combat_state)
-        
-        print(f"\n{result['text']}")
-
-        if result.get('item_used'):
-            self.player.inventory.removeItem(item)
+        self.perform_player_action(UseItemAction(item))
         
         return True
     
@@ -238,18 +262,18 @@ class CombatSystem:
         self.combat_state['defender_is_defending'] = False
         
         if defending_last_turn:
-            print(f"\n{self.enemy.name} returns to an offensive stance.\n")
+            write("\n{} returns to an offensive stance.\n", self.enemy.name)
         
-        print(f"\n--- {self.enemy.name}'s Turn ---")
+        write("\n--- {}'s Turn ---", self.enemy.name)
         
         # The enemy chooses an action
-        action_choice = random.random()
+        action_choice = self.rng.random()
         
         if action_choice < 0.7:  # 70% chance to attack
-            action = AttackAction()
+            action = AttackAction(self.rng)
             result = action.execute(self.enemy, self.player, self.combat_state)
-            print(f"{result['text']}")
-            print(f"{self.player.name}: {result['defender_hp']}/{self.player.hpMax} HP")
+            write(result['text'])
+            write("{}: {}/{} HP", self.player.name, result['defender_hp'], self.player.hpMax)
         
         elif action_choice < 0.85 or not hasattr(self.enemy, 'skill1'):  # 15% chance de se défendre
             action = DefendAction()
@@ -257,29 +281,29 @@ class CombatSystem:
             result['text'] = result['text'].replace('attacker_is_defending', 'defender_is_defending')
             self.combat_state['defender_is_defending'] = True
             self.combat_state['attacker_is_defending'] = False
-            print(f"{result['text']}")
+            write(result['text'])
         
         else:  # 15% chance d'utiliser une compétence
             if hasattr(self.enemy, 'skill1'):
-                print(f"{self.enemy.name} uses a special skill!")
+                write("{} uses a special skill!", self.enemy.name)
                 self.enemy.skill1(self.player)
             else:
-                print(f"{self.enemy.name} tries to use a skill but fails!")
+                write("{} tries to use a skill but fails!", self.enemy.name)
     
     def victory(self):
-        print("\n" + "="*60)
-        print("🎉 VICTORY! 🎉")
-        print(f"You have defeated {self.enemy.name}!")
+        write("\n" + "="*60)
+        write("🎉 VICTORY! 🎉")
+        write("You have defeated {}!", self.enemy.name)
         
         # Calcul de l'XP et du loot
-        xp_gained = self.enemy.level * random.randint(5, 12) + 20
+        xp_gained = self.enemy.level * self.rng.randint(5, 12) + 20
         self.player.xp += xp_gained
-        print(f"ou gain {xp_gained} experience points!")
+        write("ou gain {} experience points!", xp_gained)
         
-        print("="*60 + "\n")
+        write("="*60 + "\n")
 
     def defeat(self):
-        print("\n" + "="*60)
-        print("💀 DEFEAT... 💀")
-        print(f"{self.player.name} was defeated by {self.enemy.name}...")
-        print("="*60 + "\n")
+        write("\n" + "="*60)
+        write("💀 DEFEAT... 💀")
+        write("{} was defeated by {}...", self.player.name, self.enemy.name)
+        write("="*60 + "\n")
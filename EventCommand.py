@@ -1,7 +1,8 @@
 from abc import ABC, abstractmethod
 import random
 from CombatStrategy import CombatSystem
-from item.ItemFactory import ItemFactory
+from item.ItemFactory import ItemFactory, getItemFactory
+from Renderer import write
 
 class Event(ABC):
     @abstractmethod
@@ -14,54 +15,62 @@ class DialogueEvent(Event):
         self.text = dialogue or "..."
 
     def execute(self, game) -> None:
-        print(f"\n{self.from_character} : \"{self.text}\"")
+        write("\n{} : \"{}\"", self.from_character, self.text)
 
 class ShopEvent(Event):
     def __init__(self):
         self.shop_items = ["Potion", "Sword", "Shield"]
 
     def execute(self, game) -> None:
-        print("Welcome to the shop! Here are the items available for purchase:")
+        write("Welcome to the shop! Here are the items available for purchase:")
 
 class ChestEvent(Event):
-    def __init__(self, loot_table: str = None, gold_range=(5, 20)):
+    def __init__(self, loot_table: str = None, gold_range=(5, 20), item_factory: ItemFactory = None,
+                 rng: random.Random = random):
         self.loot_table = loot_table
         self.gold_range = gold_range
+        self.item_factory = item_factory or getItemFactory()
+        self.rng = rng
 
     def execute(self, game) -> None:
-        gold = random.randint(*self.gold_range)
+        rng = self.rng
+        gold = rng.randint(*self.gold_range)
         loot = None
-        item_factory = ItemFactory()
+        item_factory = self.item_factory
         
         if self.loot_table:
             loot = item_factory.createConsumable(self.loot_table)
         else:
-            chestType = random.choice(["weapon", "armor", "consumable"])
+            chestType = rng.choice(["weapon", "armor", "consumable"])
             if chestType == "weapon":
-                loot = item_factory.getRandomWeapon(max_level=game.character.level)
+                loot = item_factory.getRandomWeapon(max_level=game.character.level, rng=rng)
             elif chestType == "armor":
-                loot = item_factory.getRandomArmor(max_level=game.character.level)
+                loot = item_factory.getRandomArmor(max_level=game.character.level, rng=rng)
             else:
-                loot = item_factory.getRandomConsumable(max_level=game.character.level)
+                loot = item_factory.getRandomConsumable(max_level=game.character.level, rng=rng)
         
         if loot:
             game.character.inventory.addItem(loot)
-            print(f"Vous obtenez : {loot.name} et {gold} pièces d'or !")
+            write("Vous obtenez : {} et {} pièces d'or !", loot.name, gold)
         else:
-            print(f"Vous obtenez {gold} pièces d'or !")
+            write("Vous obtenez {} pièces d'or !", gold)
 
 class CombatEvent(Event):
-    def __init__(self, enemy):
+    def __init__(self, enemy, rng: random.Random = random):
         self.enemy = enemy
+        self.rng = rng
 
     def execute(self, game) -> None:
-        combat = CombatSystem(game.character, self.enemy)
-        victory = combat.start_combat()
-        
+        # Le moteur deroule le combat tour par tour puis rappelle onCombatEnd
+        game.startCombat(self)
+
+    def createCombat(self, character) -> CombatSystem:
+        return CombatSystem(character, self.enemy, self.rng)
+
+    def onCombatEnd(self, game, victory: bool) -> None:
         if not victory:
-            print("\nYou must return to the village to heal...")
-            # The player is teleported to the village
-            if hasattr(game.location, 'connections') and 'village' in game.location.connections:
-                game.location = game.location.connections['village']
-                game.character.hp = game.character.hpMax  # Heals the player at the village
-                print("You wake up in the village, fully healed.")
+            write("\nYou must return to the village to heal...")
+            # The player is teleported to the village (start zone of the world)
+            game.location = game.world.zone(game.world.start)
+            game.character.hp = game.character.hpMax  # Heals the player at the village
+            write("You wake up in the village, fully healed.")
@@ -1,95 +1,33 @@
-from zone.ZoneState import VillageState, ZoneState
+from GameEngine import GameEngine
 from Utils import inputMenu
 from entity.Character import Character
-from inventory.InventoryMenu import InventoryMenu
-from SaveGame import SaveGame
+from SessionRecorder import SessionRecorder
 
 class Game:
-    def __init__(self, character: Character, enemy_factory, starting_location: "ZoneState"):
-        self.character = character
-        self.enemy_factory = enemy_factory
-        self.location = starting_location
+    """Terminal frontend of the GameEngine: shows its menus with inputMenu and steps it with the choices."""
+    def __init__(self, engine: GameEngine, recorder: SessionRecorder = None):
+        self.engine = engine
+        # Enregistre les choix pour les rejouer avec Replay.py
+        self.recorder = recorder
     
-    def run(self):
-        self.location.onEnter(self)
-
-        while True:
-            if isinstance(self.location, VillageState):
-                self.villageMenu(self.location)
-            else:
-                self.exploreMenu()
-    
-    def villageMenu(self, village: VillageState):
-        choice = inputMenu("You are in the village. What would you like to do?", [
-            "Talk to villager", 
-            "Visit the merchant", 
-            "Open inventory",
-            "View stats",
-            "Explore the world !",
-            "Save the game",
-            "Quit game"
-        ])
-
-        if choice == 1:
-            print("You talk to the villagers and learn about the dangers lurking in the nearby forest.") # TODO : Add more dialogue options and interactions
-            village.strat.talkToVillagers().execute(self)
-        elif choice == 2:
-            print("You visit the merchant and browse their wares. You can buy potions, weapons, and armor to help you on your journey.") # TODO : Implement shop system
-            village.strat.merchantEvent().execute(self)
-        elif choice == 3:
-            InventoryMenu.open(self.character)
-        elif choice == 4:
-            self.character.displayStats()
-        elif choice == 5:
-            print("You leave the village and head towards the forest, ready to face the challenges ahead.") # TODO : Implement zone transition logic
-            self.travelMenu()
-        elif choice == 6:
-            saveGame = SaveGame()
-            saveGame.save(self.character)
-        elif choice == 7:
-            print("Thank you for playing! Goodbye.")
-            exit(0)
+    @property
+    def character(self) -> Character:
+        return self.engine.character
     
-    def travelMenu(self):
-        current = self.location
+    def run(self):
+        engine = self.engine
+        engine.start()
 
-        keys = list(current.connections.keys())
-        labels = []
-        for key in keys:
-            zone = current.connections[key]
-            locked = not zone.canEnter(self)
-            labels.append(f"{zone.name} {'(Locked)' if locked else ''}")
-        
-        choice = inputMenu("Where would you like to go?", labels + ["Stay here"])
-        if choice == len(labels) + 1:
-            print("You decide to stay in the village for now.")
-            return
+        try:
+            while engine.running:
+                prompt, options = engine.menu()
+                choice = inputMenu(prompt, [label for _, label in options])
+                action = options[choice - 1][0]
+                if self.recorder is not None:
+                    self.recorder.record(action)
+                engine.step(action)
+        finally:
+            if self.recorder is not None:
+                self.recorder.finish(engine)
         
-        destination_key = keys[choice - 1]
-        destination = current.connections[destination_key]
-        print(f"You travel to the {destination.name}.")
-        self.location = destination
-        self.location.onEnter(self)
-
-    def exploreMenu(self):
-        print(f"You are in {self.location.name}. (HP: {self.character.hp}/{self.character.hpMax})")
-        choice = inputMenu("What would you like to do?", [
-            "Continue exploring", 
-            "Open inventory",
-            "View stats",
-            "Return to village"
-        ])
-
-        if choice == 1:
-            print("You continue exploring the area")  
-            event = self.location.nextEvent(self)
-            if event:
-                event.execute(self)
-        elif choice == 2:
-            InventoryMenu.open(self.character)
-        elif choice == 3:
-            self.character.displayStats()
-        elif choice == 4:
-            print("You decide to return to the village to rest and resupply.")
-            self.location = self.location.connections["village"]
-            self.location.onEnter(self)
\ No newline at end of file
+        exit(0)
@@ -0,0 +1,431 @@
+import random
+from typing import TYPE_CHECKING, List, Optional, Tuple
+from zone.ZoneState import VillageState
+from zone.ZoneGraph import DEFAULT_CACHE_SIZE, WorldMap, ZoneGraph, getWorldMap, zoneBuilders
+from entity.Character import Character
+from entity.EnemyFactory import EnemyFactory
+from item.ItemFactory import ItemFactory, getItemFactory
+from CombatStrategy import AttackAction, DefendAction, UseItemAction
+from save.SaveWriter import SaveWriter
+from RngStream import RngStream
+from Renderer import write
+
+if TYPE_CHECKING:
+    from EventCommand import CombatEvent
+
+
+def buildWorld(enemy_factory: EnemyFactory, item_factory: ItemFactory = None, rng: random.Random = random,
+               world_map: WorldMap = None, cache_size: int = DEFAULT_CACHE_SIZE) -> ZoneGraph:
+    """The zones of a new session, on the shared world map (zone/world.json by default).
+
+    No zone is built here, each one is created on its first visit.
+    """
+    builders = zoneBuilders(enemy_factory, item_factory or getItemFactory(), rng)
+    return ZoneGraph(world_map or getWorldMap(), builders, cache_size)
+
+
+def giveStarterItems(character: Character, item_factory: ItemFactory = None) -> None:
+    item_factory = item_factory or getItemFactory()
+    # Ajoute quelques potions
+    for _ in range(2):
+        potion = item_factory.createConsumable("Potion de soin")
+        if potion:
+            character.inventory.addItem(potion)
+
+
+def createEngine(character: Character, rng: RngStream, enemy_factory: EnemyFactory = None,
+                 item_factory: ItemFactory = None, save_writer: SaveWriter = None) -> "GameEngine":
+    """Sets up a new session: starter items, a world drawing from rng and the engine on top of it.
+
+    Everything random in the session then only depends on the character and on
+    rng's seed, which is what Replay relies on.
+    """
+    enemy_factory = enemy_factory or EnemyFactory()
+    item_factory = item_factory or getItemFactory()
+    giveStarterItems(character, item_factory)
+    world = buildWorld(enemy_factory, item_factory, rng)
+    return GameEngine(character, enemy_factory, world, save_writer, rng)
+
+
+class GameEngine:
+    """The game as a state machine, with no input() nor exit().
+
+    state() describes the current screen, legalActions() lists the action
+    strings accepted by step(action), and menu() gives the same actions with
+    their labels for a frontend. Parameterized actions look like
+    "equip_weapon:2" with 1-based indexes, as in the menus. All output goes
+    through the Renderer, so a session runs headless under a NullSink or
+    CaptureSink.
+    """
+
+    def __init__(self, character: Character, enemy_factory, world: ZoneGraph,
+                 save_writer: SaveWriter = None, rng: RngStream = None):
+        self.character = character
+        # Le monde doit avoir ete construit avec ce meme flux (voir buildWorld)
+        self.rng = rng or RngStream()
+        character.seed = self.rng.initial_seed
+        self.enemy_factory = enemy_factory
+        self.world = world
+        self.location = world.zone(world.start)
+        self.save_writer = save_writer
+        # Un serveur partage son writer entre les sessions et le vide a l'arret, sans bloquer sur quit
+        self.flush_on_quit = True
+        self.screen: Optional[str] = None
+        self.combat = None
+        self.combat_event: Optional["CombatEvent"] = None
+        self._drop_item = None
+        self.running = False
+
+    def start(self) -> None:
+        self.running = True
+        self.location.onEnter(self)
+        self._beginCombat()
+
+    # --- State ---
+
+    @property
+    def currentScreen(self) -> str:
+        if not self.running:
+            return "quit"
+        if self.screen is not None:
+            return self.screen
+        return "village" if isinstance(self.location, VillageState) else "explore"
+
+    def state(self) -> dict:
+        character = self.character
+        inventory = character.inventory
+        state = {
+            "screen": self.currentScreen,
+            "location": self.location.name,
+            "zone": self.location.zone_id,
+            "character": {
+                "name": character.name,
+                "type": character.type,
+                "level": character.level,
+                "xp": character.xp,
+                "hp": character.hp,
+                "hpMax": character.hpMax
+            },
+            "inventory": {
+                "items": [item.name for item in inventory.items],
+                "equipped_weapon": inventory.equipped_weapon.name if inventory.equipped_weapon else None,
+                "equipped_armor": inventory.equipped_armor.name if inventory.equipped_armor else None
+            },
+            "combat": None
+        }
+        if self.combat is not None:
+            enemy = self.combat.enemy
+            state["combat"] = {
+                "enemy": enemy.name,
+                "level": enemy.level,
+                "hp": max(0, enemy.hp),
+                "hpMax": enemy.hpMax,
+                "turn": self.combat.turn_count
+            }
+        return state
+
+    def legalActions(self) -> List[str]:
+        return [action for action, _ in self.menu()[1]]
+
+    def menu(self) -> Tuple[str, List[Tuple[str, str]]]:
+        """Prompt and (action, label) options of the current screen."""
+        screen = self.currentScreen
+        if screen == "quit":
+            return "", []
+        return getattr(self, f"_{screen}Menu")()
+
+    # --- Actions ---
+
+    def step(self, action: str) -> None:
+        if action not in self.legalActions():
+            raise ValueError(f"Illegal action '{action}' on screen '{self.currentScreen}'")
+
+        name, _, arg = action.partition(":")
+        getattr(self, f"_do_{name}")(int(arg) if arg else None)
+        self._beginCombat()
+
+    def startCombat(self, event: "CombatEvent") -> None:
+        """Called by CombatEvent: the fight is then played through the combat screen."""
+        self.combat = event.createCombat(self.character)
+        self.combat_event = event
+        self.screen = "combat"
+
+    def _beginCombat(self) -> None:
+        # Le combat s'affiche une fois l'action terminee, apres les messages de la zone
+        if self.combat is not None and self.combat.turn_count == 0:
+            self.combat.display_header()
+            self.combat.next_turn()
+
+    def _endCombat(self, victory: bool) -> None:
+        event = self.combat_event
+        self.combat = self.combat_event = None
+        self.screen = None
+        event.onCombatEnd(self, victory)
+        self.enemy_factory.release(event.enemy)
+
+    def _playTurn(self, action) -> None:
+        self.combat.perform_player_action(action)
+        outcome = self.combat.finish_turn()
+        if outcome is None:
+            self.screen = "combat"
+            self.combat.next_turn()
+        else:
+            self._endCombat(outcome)
+
+    def _showInventory(self) -> None:
+        self.screen = "inventory"
+        write("\n")
+        self.character.inventory.display()
+
+    # --- Village ---
+
+    def _villageMenu(self):
+        return "You are in the village. What would you like to do?", [
+            ("talk", "Talk to villager"),
+            ("merchant", "Visit the merchant"),
+            ("inventory", "Open inventory"),
+            ("stats", "View stats"),
+            ("travel", "Explore the world !"),
+            ("save", "Save the game"),
+            ("quit", "Quit game")
+        ]
+
+    def _do_talk(self, _):
+        write("You talk to the villagers and learn about the dangers lurking in the nearby forest.") # TODO : Add more dialogue options and interactions
+        self.location.strat.talkToVillagers().execute(self)
+
+    def _do_merchant(self, _):
+        write("You visit the merchant and browse their wares. You can buy potions, weapons, and armor to help you on your journey.") # TODO : Implement shop system
+        self.location.strat.merchantEvent().execute(self)
+
+    def _do_inventory(self, _):
+        self._showInventory()
+
+    def _do_stats(self, _):
+        self.character.displayStats()
+
+    def _do_travel(self, _):
+        write("You leave the village and head towards the forest, ready to face the challenges ahead.") # TODO : Implement zone transition logic
+        self.screen = "travel"
+
+    def _do_save(self, _):
+        if self.save_writer is None:
+            self.save_writer = SaveWriter()
+        self.save_writer.submit(self.character)
+
+    def _do_quit(self, _):
+        # Les sauvegardes en cours doivent finir avant de quitter
+        if self.save_writer is not None and self.flush_on_quit:
+            self.save_writer.flush()
+        write("Thank you for playing! Goodbye.")
+        self.running = False
+
+    # --- Travel ---
+
+    def _travelMenu(self):
+        # Lu dans la carte, sans construire les zones voisines
+        world_map = self.world.map
+        options = []
+        for index, zone_id in enumerate(world_map.connections(self.location.zone_id), 1):
+            locked = not world_map.canEnter(zone_id, self.character)
+            options.append((f"go:{index}", f"{world_map.spec(zone_id)['name']} {'(Locked)' if locked else ''}"))
+        return "Where would you like to go?", options + [("stay", "Stay here")]
+
+    def _do_go(self, index: int):
+        world_map = self.world.map
+        zone_id = world_map.connections(self.location.zone_id)[index - 1]
+        if not world_map.canEnter(zone_id, self.character):
+            spec = world_map.spec(zone_id)
+            write("The {} is locked, you need: {}.", spec["name"], spec["requires"])
+            return
+        self.screen = None
+        self.location = self.world.zone(zone_id)
+        write("You travel to the {}.", self.location.name)
+        self.location.onEnter(self)
+
+    def _do_stay(self, _):
+        self.screen = None
+        write("You decide to stay in the village for now.")
+
+    # --- Exploration ---
+
+    def _exploreMenu(self):
+        prompt = f"You are in {self.location.name}. (HP: {self.character.hp}/{self.character.hpMax})\nWhat would you like to do?"
+        return prompt, [
+            ("continue", "Continue exploring"),
+            ("inventory", "Open inventory"),
+            ("stats", "View stats"),
+            ("return", "Return to village")
+        ]
+
+    def _do_continue(self, _):
+        write("You continue exploring the area")
+        event = self.location.nextEvent(self)
+        if event:
+            event.execute(self)
+
+    def _do_return(self, _):
+        write("You decide to return to the village to rest and resupply.")
+        route = self.world.map.route(self.location.zone_id, self.world.start)
+        if route is None:
+            write("There is no way back to the village from here.")
+            return
+        if len(route) > 2:
+            write("You travel back through {}.", ", ".join(self.world.map.spec(zone_id)["name"] for zone_id in route[1:-1]))
+        self.location = self.world.zone(self.world.start)
+        self.location.onEnter(self)
+
+    # --- Combat ---
+
+    def _combatMenu(self):
+        return "What do you want to do?", [
+            ("attack", "Attack"),
+            ("skill", "Skill"),
+            ("items", "Use an item"),
+            ("defend", "Defend")
+        ]
+
+    def _do_attack(self, _):
+        self._playTurn(AttackAction(self.combat.rng))
+
+    def _do_defend(self, _):
+        self._playTurn(DefendAction())
+
+    def _do_skill(self, _):
+        write("No skills not implemented!")
+
+    def _do_items(self, _):
+        if not self.character.inventory.getConsumables():
+            write("No consumables available!")
+            return
+        self.screen = "combat_items"
+
+    def _combat_itemsMenu(self):
+        consumables = self.character.inventory.getConsumables()
+        options = [(f"use_item:{i}", consumable.getDescription()) for i, consumable in enumerate(consumables, 1)]
+        return "Which item do you want to use?", options + [("back_combat", "Back")]
+
+    def _do_use_item(self, index: int):
+        self._playTurn(UseItemAction(self.character.inventory.getConsumables()[index - 1]))
+
+    def _do_back_combat(self, _):
+        self.screen = "combat"
+
+    # --- Inventory ---
+
+    def _inventoryMenu(self):
+        return "What would you like to do?", [
+            ("weapons", "Equip a weapon"),
+            ("armors", "Equip armor"),
+            ("consumables", "Use a consumable"),
+            ("unequip_weapon", "Unequip weapon"),
+            ("unequip_armor", "Unequip armor"),
+            ("drop", "Drop an item"),
+            ("inventory_stats", "View my stats"),
+            ("close", "Back")
+        ]
+
+    def _openItemScreen(self, screen: str, items: list, empty_message: str):
+        if not items:
+            write(empty_message)
+            self._showInventory()
+            return
+        self.screen = screen
+
+    def _do_weapons(self, _):
+        self._openItemScreen("inventory_weapons", self.character.inventory.getWeapons(), "You have no weapons in your inventory.")
+
+    def _do_armors(self, _):
+        self._openItemScreen("inventory_armors", self.character.inventory.getArmors(), "You have no armors in your inventory.")
+
+    def _do_consumables(self, _):
+        self._openItemScreen("inventory_consumables", self.character.inventory.getConsumables(), "You have no consumables in your inventory.")
+
+    def _do_drop(self, _):
+        self._openItemScreen("inventory_drop", self.character.inventory.items, "Your inventory is empty.")
+
+    def _do_unequip_weapon(self, _):
+        self.character.inventory.unequipWeapon()
+        self._showInventory()
+
+    def _do_unequip_armor(self, _):
+        self.character.inventory.unequipArmor()
+        self._showInventory()
+
+    def _do_inventory_stats(self, _):
+        self.character.displayStats()
+        self._showInventory()
+
+    def _do_close(self, _):
+        self.screen = None
+
+    def _do_cancel(self, _):
+        self._drop_item = None
+        self._showInventory()
+
+    def _equipmentLabels(self, items: list, equipped) -> List[str]:
+        labels = []
+        for item in items:
+            equipped_label = " [EQUIPPED]" if item == equipped else ""
+            can_equip = " Insufficient level" if not item.canUse(self.character) else ""
+            labels.append(f"{item.getDescription()}{equipped_label}{can_equip}")
+        return labels
+
+    def _inventory_weaponsMenu(self):
+        inventory = self.character.inventory
+        labels = self._equipmentLabels(inventory.getWeapons(), inventory.equipped_weapon)
+        options = [(f"equip_weapon:{i}", label) for i, label in enumerate(labels, 1)]
+        return "Which weapon would you like to equip?", options + [("cancel", "Cancel")]
+
+    def _do_equip_weapon(self, index: int):
+        inventory = self.character.inventory
+        inventory.equipWeapon(inventory.getWeapons()[index - 1], self.character)
+        self._showInventory()
+
+    def _inventory_armorsMenu(self):
+        inventory = self.character.inventory
+        labels = self._equipmentLabels(inventory.getArmors(), inventory.equipped_armor)
+        options = [(f"equip_armor:{i}", label) for i, label in enumerate(labels, 1)]
+        return "Which armor would you like to equip?", options + [("cancel", "Cancel")]
+
+    def _do_equip_armor(self, index: int):
+        inventory = self.character.inventory
+        inventory.equipArmor(inventory.getArmors()[index - 1], self.character)
+        self._showInventory()
+
+    def _inventory_consumablesMenu(self):
+        options = []
+        for i, consumable in enumerate(self.character.inventory.getConsumables(), 1):
+            can_use = " Insufficient level" if not consumable.canUse(self.character) else ""
+            options.append((f"use:{i}", f"{consumable.getDescription()}{can_use}"))
+        return "Which consumable would you like to use?", options + [("cancel", "Cancel")]
+
+    def _do_use(self, index: int):
+        inventory = self.character.inventory
+        inventory.useConsumable(inventory.getConsumables()[index - 1], self.character)
+        self._showInventory()
+
+    def _inventory_dropMenu(self):
+        icons = {"weapon": "⚔️", "armor": "🛡️"}
+        options = [(f"drop_item:{i}", f"{icons.get(item.item_type.value, '🧪')} {item.name}")
+                   for i, item in enumerate(self.character.inventory.items, 1)]
+        return "Which item would you like to drop?", options + [("cancel", "Cancel")]
+
+    def _do_drop_item(self, index: int):
+        self._drop_item = self.character.inventory.items[index - 1]
+        self.screen = "inventory_drop_confirm"
+
+    def _inventory_drop_confirmMenu(self):
+        return f"Are you sure you want to drop {self._drop_item.name}?", [("confirm", "Yes"), ("cancel", "No")]
+
+    def _do_confirm(self, _):
+        inventory = self.character.inventory
+        item, self._drop_item = self._drop_item, None
+        # Unequip the item if it is equipped
+        if item == inventory.equipped_weapon:
+            inventory.unequipWeapon()
+        elif item == inventory.equipped_armor:
+            inventory.unequipArmor()
+
+        inventory.removeItem(item)
+        self._showInventory()
@@ -0,0 +1,110 @@
+import atexit
+import sys
+from contextlib import contextmanager
+from typing import List
+
+
+class OutputSink:
+    """Destination of all game text.
+
+    Messages are given as a str.format template plus its arguments so that a
+    sink which discards output never pays for the formatting.
+    """
+    enabled = True
+
+    def write(self, template: str, *args) -> None:
+        pass
+
+    def render(self, template: str, *args) -> str:
+        return template.format(*args) if args else template
+
+    def flush(self) -> None:
+        pass
+
+
+class TerminalSink(OutputSink):
+    """Buffers the lines of a menu frame and writes them to the terminal in one go."""
+
+    def __init__(self, stream=None):
+        self.stream = stream
+        self.buffer: List[str] = []
+
+    def write(self, template: str, *args) -> None:
+        self.buffer.append(template.format(*args) if args else template)
+
+    def flush(self) -> None:
+        if not self.buffer:
+            return
+        stream = self.stream or sys.stdout
+        self.buffer.append("")
+        stream.write("\n".join(self.buffer))
+        stream.flush()
+        self.buffer.clear()
+
+
+class NullSink(OutputSink):
+    """Discards everything without formatting it."""
+    enabled = False
+
+    def render(self, template: str, *args) -> str:
+        return ""
+
+
+class CaptureSink(OutputSink):
+    """Keeps every line in memory, for tests and headless frontends."""
+
+    def __init__(self):
+        self.lines: List[str] = []
+
+    def write(self, template: str, *args) -> None:
+        self.lines.append(template.format(*args) if args else template)
+
+    def text(self) -> str:
+        return "\n".join(self.lines)
+
+    def clear(self) -> None:
+        self.lines.clear()
+
+
+_sink: OutputSink = TerminalSink()
+
+
+def getSink() -> OutputSink:
+    return _sink
+
+
+def setSink(sink: OutputSink) -> OutputSink:
+    """Installs a new sink and returns the previous one, after flushing it."""
+    global _sink
+    previous = _sink
+    previous.flush()
+    _sink = sink
+    return previous
+
+
+@contextmanager
+def useSink(sink: OutputSink):
+    previous = setSink(sink)
+    try:
+        yield sink
+    finally:
+        setSink(previous)
+
+
+def isEnabled() -> bool:
+    return _sink.enabled
+
+
+def write(template: str, *args) -> None:
+    _sink.write(template, *args)
+
+
+def render(template: str, *args) -> str:
+    return _sink.render(template, *args)
+
+
+def flush() -> None:
+    _sink.flush()
+
+
+atexit.register(flush)
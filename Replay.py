@@ -0,0 +1,203 @@
+import argparse
+import copy
+import cProfile
+import json
+import os
+import pstats
+import tempfile
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+from GameEngine import GameEngine, createEngine
+from SaveGame import SaveGame, _deserialize_character
+from save.SaveWriter import SaveWriter
+from SessionRecorder import RECORDING_VERSION, finalState
+from RngStream import RngStream
+from Renderer import NullSink, useSink, write, flush
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Premier element du chemin (relatif a la racine du jeu) -> sous-systeme
+SUBSYSTEMS = {
+    "CombatStrategy.py": "CombatSystem",
+    "item": "ItemFactory",
+    "inventory": "Inventory",
+    "SaveGame.py": "SaveGame",
+    "save": "SaveGame",
+    "entity": "Entities",
+    "StatModifier.py": "Entities",
+    "zone": "Zones",
+    "EventCommand.py": "Zones",
+    "GameEngine.py": "Engine",
+    "Renderer.py": "Renderer",
+    "RngStream.py": "RngStream"
+}
+OTHER = "Other"
+
+
+class ReplayMismatchError(AssertionError):
+    pass
+
+
+def loadRecording(path: str) -> dict:
+    with open(path, 'r', encoding='utf-8') as f:
+        recording = json.load(f)
+    if recording.get("version") != RECORDING_VERSION:
+        raise ValueError(f"Unsupported recording version {recording.get('version')}")
+    if recording.get("final") is None:
+        raise ValueError("Recording has no final state")
+    return recording
+
+
+def replay(recording: dict, save_writer: SaveWriter = None) -> GameEngine:
+    """Plays the recorded actions on a fresh engine with no output and returns it.
+
+    Without a save_writer, recorded saves go to a temporary directory that is
+    removed afterwards, never to the player's saves.
+    """
+    if save_writer is None:
+        with tempfile.TemporaryDirectory() as saves_dir:
+            save_writer = SaveWriter(SaveGame(saves_dir=saves_dir), background=False)
+            engine = replay(recording, save_writer)
+            save_writer.close()
+        return engine
+
+    character = _deserialize_character(copy.deepcopy(recording["character"]))
+    with useSink(NullSink()):
+        engine = createEngine(character, RngStream(recording["seed"]), save_writer=save_writer)
+        engine.start()
+        for action in recording["actions"]:
+            engine.step(action)
+    return engine
+
+
+def _firstDifference(expected, actual, path: str = "") -> Optional[str]:
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        for key in sorted(set(expected) | set(actual), key=str):
+            difference = _firstDifference(expected.get(key), actual.get(key), f"{path}.{key}" if path else str(key))
+            if difference:
+                return difference
+        return None
+    if isinstance(expected, list) and isinstance(actual, list) and len(expected) == len(actual):
+        for i, (a, b) in enumerate(zip(expected, actual)):
+            difference = _firstDifference(a, b, f"{path}[{i}]")
+            if difference:
+                return difference
+        return None
+    if expected != actual:
+        return f"{path or 'state'}: expected {expected!r}, got {actual!r}"
+    return None
+
+
+def checkReplay(recording: dict, engine: GameEngine) -> None:
+    difference = _firstDifference(recording["final"], finalState(engine))
+    if difference:
+        raise ReplayMismatchError(f"Replay diverged from the recording at {difference}")
+
+
+def _subsystem(filename: str) -> str:
+    if not filename.startswith(ROOT):
+        return OTHER
+    first = os.path.relpath(filename, ROOT).split(os.sep)[0]
+    return SUBSYSTEMS.get(first, OTHER)
+
+
+def subsystemTimings(stats: pstats.Stats) -> Dict[str, float]:
+    """Own time of every function, per sub-system of the game.
+
+    Library and builtin calls (json, struct, sqlite3...) are charged to the
+    sub-systems that called them, in proportion of the time spent per caller.
+    """
+    shares_cache = {}
+
+    def shares(function, visiting) -> Dict[str, float]:
+        if function in shares_cache:
+            return shares_cache[function]
+        filename = function[0]
+        if filename.startswith(ROOT) or function in visiting or function not in stats.stats:
+            result = {_subsystem(filename): 1.0}
+        else:
+            callers = stats.stats[function][4]
+            total = sum(edge[2] for edge in callers.values())
+            if not total:
+                result = {OTHER: 1.0}
+            else:
+                result = defaultdict(float)
+                for caller, edge in callers.items():
+                    for name, share in shares(caller, visiting | {function}).items():
+                        result[name] += share * edge[2] / total
+        shares_cache[function] = result
+        return result
+
+    timings = defaultdict(float)
+    for function, (_, _, own_time, _, _) in stats.stats.items():
+        for name, share in shares(function, frozenset()).items():
+            timings[name] += own_time * share
+    return dict(timings)
+
+
+def benchmarkReplay(recording: dict, repeat: int = 5, profile: bool = False) -> dict:
+    """Replays a recording `repeat` times, saves included, and checks every final state.
+
+    Saves go synchronously to a temporary directory so their cost is counted.
+    With profile, the time is also split per sub-system (see SUBSYSTEMS).
+    """
+    profiler = cProfile.Profile() if profile else None
+    durations: List[float] = []
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory() as saves_dir:
+            save_writer = SaveWriter(SaveGame(saves_dir=saves_dir), background=False)
+            start = time.perf_counter()
+            if profiler:
+                profiler.enable()
+            engine = replay(recording, save_writer)
+            if profiler:
+                profiler.disable()
+            durations.append(time.perf_counter() - start)
+            save_writer.close()
+        checkReplay(recording, engine)
+
+    best = min(durations)
+    report = {
+        "actions": len(recording["actions"]),
+        "repeat": repeat,
+        "best_seconds": best,
+        "mean_seconds": sum(durations) / len(durations),
+        "actions_per_second": len(recording["actions"]) / best if best else 0.0,
+        "subsystems": None
+    }
+    if profiler:
+        report["subsystems"] = subsystemTimings(pstats.Stats(profiler))
+    return report
+
+
+def printReport(report: dict) -> None:
+    write("{} actions replayed {} times, final state identical", report["actions"], report["repeat"])
+    write("best {:.3f}s, mean {:.3f}s ({:.0f} actions/s)",
+          report["best_seconds"], report["mean_seconds"], report["actions_per_second"])
+    if report["subsystems"]:
+        total = sum(report["subsystems"].values())
+        write("\nProfiled time per sub-system (all runs, {:.3f}s):", total)
+        for name, seconds in sorted(report["subsystems"].items(), key=lambda entry: -entry[1]):
+            write("  {:<14}{:>9.3f}s {:>6.1f}%", name, seconds, 100 * seconds / total if total else 0.0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded session (main.py --record) headless and time it.")
+    parser.add_argument("recording", help="recording file written by main.py --record")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--profile", action="store_true", help="split the time per sub-system")
+    args = parser.parse_args()
+
+    try:
+        report = benchmarkReplay(loadRecording(args.recording), args.repeat, args.profile)
+    except (OSError, ValueError, ReplayMismatchError) as e:
+        write("Replay failed: {}", e)
+        flush()
+        exit(1)
+    printReport(report)
+    flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+import os
+import random
+
+
+def newSeed() -> int:
+    # 63 bits pour tenir dans un entier signe (SQLite, struct 'q')
+    return int.from_bytes(os.urandom(8), "little") >> 1
+
+
+class RngStream(random.Random):
+    """Seeded random stream owned by one session, combat or simulation.
+
+    random() and friends are the inherited C generator. The sequence only
+    depends on the seed and on the calls made, so a run replays bit-for-bit
+    from its seed.
+    """
+
+    def __init__(self, seed: int = None):
+        super().__init__(newSeed() if seed is None else seed)
+
+    def seed(self, a=None, version=2) -> None:
+        if a is None:
+            a = newSeed()
+        super().seed(a, version)
+        self.initial_seed = a
+
+    def getstate(self):
+        return super().getstate(), self.initial_seed
+
+    def setstate(self, state) -> None:
+        base, self.initial_seed = state
+        super().setstate(base)
@@ -1,11 +1,17 @@
 import os
 import json
+import heapq
+import time
 from enum import Enum
 from datetime import datetime
+from difflib import SequenceMatcher
 from entity.Character import Character, Warrior, Mage, Thief
 from inventory.Inventory import Inventory
 from item.Item import Weapon, Armor, Consumable, ModifierType
 from Utils import inputMenu
+from Renderer import write
+from save.BinaryCodec import BINARY_EXT, encodeCharacter, encodeState, decodeCharacter
+from save.SqliteBackend import SqliteSaveBackend
 
 
 SAVES_DIR = os.path.join(os.path.dirname(__file__), 'saves')
@@ -14,11 +20,44 @@ SAVES_DIR = os.path.join(os.path.dirname(__file__), 'saves')
 def serialize(obj):
     if isinstance(obj, Enum):
         return obj.value
+    if hasattr(obj, 'toDict'):
+        return obj.toDict()
     if hasattr(obj, '__dict__'):
-        return obj.__dict__
+        return {key: value for key, value in obj.__dict__.items() if not key.startswith('_')}
     raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
 
 
+def _migrate_consumable_stacks(state: dict) -> None:
+    # Version 1 : les consommables ont un etat (is_used) et une quantite
+    inventory = state.get("inventory") or {}
+    items = list(inventory.get("items", [])) + [inventory.get("equipped_weapon"), inventory.get("equipped_armor")]
+    for item in items:
+        if item and item.get("item_type") == "consumable":
+            item.setdefault("is_used", False)
+            item.setdefault("quantity", 1)
+
+
+def _migrate_seed(state: dict) -> None:
+    # Version 2 : la graine du flux aleatoire de la partie, inconnue pour les anciennes sauvegardes
+    state.setdefault("seed", None)
+
+
+# MIGRATIONS[i] upgrades a save state from schema version i to i + 1, in place
+MIGRATIONS = [_migrate_consumable_stacks, _migrate_seed]
+SAVE_SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def migrateState(state: dict) -> dict:
+    """Upgrades a save state to SAVE_SCHEMA_VERSION. Saves without a version are version 0."""
+    version = state.get("version", 0)
+    if version > SAVE_SCHEMA_VERSION:
+        raise ValueError(f"Save schema version {version} is newer than supported version {SAVE_SCHEMA_VERSION}")
+    for migration in MIGRATIONS[version:]:
+        migration(state)
+    state["version"] = SAVE_SCHEMA_VERSION
+    return state
+
+
 def _deserialize_item(data: dict):
     item_type = data["item_type"]
     modifier_type = ModifierType(data["modifier_type"])
@@ -51,12 +90,14 @@ def _deserialize_item(data: dict):
             apparition_rate=data["apparition_rate"]
         )
         c.is_used = data.get("is_used", False)
+        c.quantity = data.get("quantity", 1)
         return c
     return None
 
 
 def _deserialize_character(data: dict) -> Character:
     """Convertit un dict JSON en objet Character (Warrior/Mage/Thief)."""
+    data = migrateState(data)
     char_type = data["type"]
     name = data["name"]
 
@@ -78,66 +119,381 @@ def _deserialize_character(data: dict) -> Character:
     character.intelligence = data["intelligence"]
     character.agility = data["agility"]
     character.critChance = data["critChance"]
+    character.seed = data["seed"]
 
     # Restaure l'inventaire
     inv_data = data.get("inventory", {})
-    character.inventory = Inventory()
+    inventory = Inventory()
 
     for item_data in inv_data.get("items", []):
         item = _deserialize_item(item_data)
         if item:
-            character.inventory.items.append(item)
+            inventory.restoreItem(item)
 
     if inv_data.get("equipped_weapon"):
-        character.inventory.equipped_weapon = _deserialize_item(inv_data["equipped_weapon"])
+        inventory.equipped_weapon = _deserialize_item(inv_data["equipped_weapon"])
 
     if inv_data.get("equipped_armor"):
-        character.inventory.equipped_armor = _deserialize_item(inv_data["equipped_armor"])
+        inventory.equipped_armor = _deserialize_item(inv_data["equipped_armor"])
+
+    # Assigned last so the character's stat cache is rebuilt with the restored equipment
+    character.inventory = inventory
 
     return character
 
 
+JOURNAL_EXT = '.journal'
+SAVE_EXTENSIONS = ('.json', JOURNAL_EXT, BINARY_EXT)
+SAVE_FORMATS = ('journal', 'binary', 'sqlite')
+MANIFEST_FILE = 'index.json'
+DATABASE_FILE = 'saves.db'
+# Nombre de deltas apres lequel le journal est replie dans un nouveau snapshot
+JOURNAL_COMPACT_EVERY = 50
+
+
+def writeFileAtomic(filepath: str, data: bytes) -> None:
+    """Writes to a temp file next to the target, fsyncs it, then renames it over the target."""
+    tmp_path = filepath + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, filepath)
+
+
+def toPlainData(obj):
+    """Converts a character (or any serializable object) into plain JSON types."""
+    if isinstance(obj, (str, int, float, bool)) or obj is None:
+        return obj
+    if isinstance(obj, dict):
+        return {key: toPlainData(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [toPlainData(value) for value in obj]
+    return toPlainData(serialize(obj))
+
+
+def _diff_items(old_items: list, new_items: list) -> list:
+    """Splice operations turning old_items into new_items, to apply from last to first."""
+    old_keys = [json.dumps(item, sort_keys=True) for item in old_items]
+    new_keys = [json.dumps(item, sort_keys=True) for item in new_items]
+    ops = []
+    for tag, i1, i2, j1, j2 in SequenceMatcher(None, old_keys, new_keys, autojunk=False).get_opcodes():
+        if tag != 'equal':
+            ops.append([i1, i2, new_items[j1:j2]])
+    return ops[::-1]
+
+
+def _diff_state(old: dict, new: dict) -> dict:
+    delta = {}
+
+    changed = {key: value for key, value in new.items() if key != "inventory" and old.get(key) != value}
+    if changed:
+        delta["set"] = changed
+
+    old_inv, new_inv = old.get("inventory", {}), new.get("inventory", {})
+    inventory = {}
+    for slot in ("equipped_weapon", "equipped_armor"):
+        if old_inv.get(slot) != new_inv.get(slot):
+            inventory[slot] = new_inv.get(slot)
+    splices = _diff_items(old_inv.get("items", []), new_inv.get("items", []))
+    if splices:
+        inventory["splices"] = splices
+    if inventory:
+        delta["inventory"] = inventory
+
+    return delta
+
+
+def _apply_delta(state: dict, delta: dict) -> None:
+    state.update(delta.get("set", {}))
+
+    inventory_delta = delta.get("inventory")
+    if not inventory_delta:
+        return
+
+    inventory = state.setdefault("inventory", {})
+    items = inventory.setdefault("items", [])
+    for start, end, new_items in inventory_delta.get("splices", []):
+        items[start:end] = new_items
+    for slot in ("equipped_weapon", "equipped_armor"):
+        if slot in inventory_delta:
+            inventory[slot] = inventory_delta[slot]
+
+
+def _hasTornTail(filepath: str) -> bool:
+    """True when the last record of a journal was not completely written."""
+    try:
+        with open(filepath, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell() == 0:
+                return False
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) != b"\n"
+    except OSError:
+        return False
+
+
+def _fileStamp(filepath: str):
+    """(size, mtime) of a file, None if it does not exist."""
+    try:
+        stat = os.stat(filepath)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+def readJournal(filepath: str):
+    """Folds a journal into (state, number of deltas). A torn last record is ignored."""
+    state, deltas = None, 0
+    with open(filepath, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                break
+            if "snapshot" in record:
+                state, deltas = record["snapshot"], 0
+            elif state is not None:
+                _apply_delta(state, record["delta"])
+                deltas += 1
+    return state, deltas
+
+
+class SaveManifest:
+    """Index of the saves directory kept in saves/index.json.
+
+    Every save updates its entry (name, class, level, timestamp, path) and the
+    file is rewritten atomically, so listing saves never stats the directory.
+    """
+
+    def __init__(self, path: str = None, saves_dir: str = SAVES_DIR):
+        self.saves_dir = saves_dir
+        self.path = path or os.path.join(saves_dir, MANIFEST_FILE)
+        self._entries = None
+
+    def entries(self) -> dict:
+        if self._entries is None:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self._entries = json.load(f)["saves"]
+            except (OSError, ValueError, KeyError):
+                self.rebuild()
+        return self._entries
+
+    def record(self, filepath: str, name: str, char_type: str, level: int, timestamp: float = None) -> None:
+        self.entries()[os.path.basename(filepath)] = {
+            "name": name,
+            "type": char_type,
+            "level": level,
+            "timestamp": timestamp if timestamp is not None else time.time(),
+            "path": os.path.basename(filepath)
+        }
+        self._write()
+
+    def remove(self, filename: str) -> None:
+        if self.entries().pop(filename, None) is not None:
+            self._write()
+
+    def latest(self, count: int = 5, name: str = None) -> list:
+        entries = self.entries().values()
+        if name is not None:
+            entries = [entry for entry in entries if entry["name"] == name]
+        return heapq.nlargest(count, entries, key=lambda entry: entry["timestamp"])
+
+    def rebuild(self) -> None:
+        """Rebuilds the index from the save files, only needed once for older save directories."""
+        self._entries = {}
+        if os.path.isdir(self.saves_dir):
+            for filename in os.listdir(self.saves_dir):
+                if not filename.endswith(SAVE_EXTENSIONS):
+                    continue
+                filepath = os.path.join(self.saves_dir, filename)
+                try:
+                    character = SaveGame.loadCharacter(filepath)
+                except (OSError, ValueError, KeyError, TypeError):
+                    continue
+                self._entries[filename] = {
+                    "name": character.name,
+                    "type": character.type,
+                    "level": character.level,
+                    "timestamp": os.path.getmtime(filepath),
+                    "path": filename
+                }
+        self._write()
+
+    def _write(self) -> None:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        writeFileAtomic(self.path, json.dumps({"saves": self._entries}, ensure_ascii=False).encode('utf-8'))
+
+
 class SaveGame:
+    """Saves characters as append-only journals, or as compact binary snapshots.
+
+    A journal starts with a full snapshot; every later save appends only the
+    fields and inventory splices that changed since the previous one. After
+    JOURNAL_COMPACT_EVERY deltas the journal is rewritten as a single snapshot.
+    The binary format (save/BinaryCodec.py) rewrites a small .sav file instead,
+    and the sqlite format keeps every character in saves/saves.db.
+    """
+
+    def __init__(self, save_format: str = 'journal', compress: bool = False, saves_dir: str = SAVES_DIR):
+        if save_format not in SAVE_FORMATS:
+            raise ValueError(f"Unknown save format: {save_format}")
+        self.save_format = save_format
+        self.compress = compress
+        self.saves_dir = saves_dir
+        # path -> [last saved state, deltas since the snapshot, (size, mtime) of the file after our last write]
+        self._journals = {}
+        self.manifest = SaveManifest(saves_dir=saves_dir)
+        self.database = None
+        if save_format == 'sqlite':
+            os.makedirs(saves_dir, exist_ok=True)
+            self.database = SqliteSaveBackend(os.path.join(saves_dir, DATABASE_FILE))
+
+    def journalPath(self, name: str, char_type: str) -> str:
+        return os.path.join(self.saves_dir, f'{name}_{char_type}{JOURNAL_EXT}')
+
+    def binaryPath(self, name: str, char_type: str) -> str:
+        return os.path.join(self.saves_dir, f'{name}_{char_type}{BINARY_EXT}')
+
+    def savePath(self, name: str, char_type: str) -> str:
+        if self.database is not None:
+            return self.database.path
+        if self.save_format == 'binary':
+            return self.binaryPath(name, char_type)
+        return self.journalPath(name, char_type)
 
     def save(self, character: Character):
-        os.makedirs(SAVES_DIR, exist_ok=True)
-        date = datetime.today().strftime('%d-%m-%Y_%H:%M:%S')
-        filepath = os.path.join(SAVES_DIR, f'{character.name}_{character.type}_save-{date}.json')
-        with open(file=filepath, mode="w") as f:
-            json.dump(character, f, indent=4, default=serialize)
-        print(f"Game saved: {os.path.basename(filepath)}")
-
-    def load(self) -> Character | None:
-        """Affiche les 5 dernieres sauvegardes et charge celle choisie."""
-        if not os.path.isdir(SAVES_DIR):
-            print("No saves directory found.")
-            return None
-        
-        save_files = [f for f in os.listdir(SAVES_DIR) if f.endswith('.json')]
-        save_files.sort(key=lambda f: os.path.getmtime(os.path.join(SAVES_DIR, f)), reverse=True)
+        filepath = self.writeState(toPlainData(character))
+        write("Game saved: {}", os.path.basename(filepath))
+
+    def writeState(self, state: dict) -> str:
+        """Writes a plain-data snapshot of a character (see toPlainData) and returns its path."""
+        state["version"] = SAVE_SCHEMA_VERSION
+        if self.database is not None:
+            self.database.writeState(state)
+            return self.database.path
+
+        os.makedirs(self.saves_dir, exist_ok=True)
+        filepath = self.savePath(state["name"], state["type"])
+        if self.save_format == 'binary':
+            writeFileAtomic(filepath, encodeState(state, self.compress))
+        else:
+            self._appendJournal(filepath, state)
+
+        self.manifest.record(filepath, state["name"], state["type"], state["level"])
+        return filepath
 
-        if not save_files:
-            print("No save files found.")
+    def _appendJournal(self, filepath: str, state: dict) -> None:
+        saved_at = datetime.now().isoformat(timespec='seconds')
+
+        journal = self._journals.get(filepath)
+        stamp = _fileStamp(filepath)
+        if journal is None or journal[2] != stamp:
+            # Premier acces, ou un autre SaveGame / processus a ecrit dans le journal : l'etat en cache est perime
+            journal = None
+            # Un delta ajoute derriere un enregistrement tronque serait ignore a la relecture
+            if stamp is not None and not _hasTornTail(filepath):
+                state_on_disk, deltas = readJournal(filepath)
+                journal = self._journals[filepath] = [state_on_disk, deltas, stamp]
+
+        if journal is None or journal[0] is None or journal[1] >= JOURNAL_COMPACT_EVERY:
+            self._writeSnapshot(filepath, state, saved_at)
+        else:
+            delta = _diff_state(journal[0], state)
+            with open(filepath, 'a', encoding='utf-8') as f:
+                f.write(json.dumps({"delta": delta, "saved_at": saved_at}, separators=(',', ':'), ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            journal[0], journal[1], journal[2] = state, journal[1] + 1, _fileStamp(filepath)
+
+    def compact(self, filepath: str) -> None:
+        """Folds every delta of a journal back into a single snapshot."""
+        state, _ = readJournal(filepath)
+        if state is not None:
+            self._writeSnapshot(filepath, state, datetime.now().isoformat(timespec='seconds'))
+
+    def _writeSnapshot(self, filepath: str, state: dict, saved_at: str) -> None:
+        record = json.dumps({"snapshot": state, "saved_at": saved_at}, separators=(',', ':'), ensure_ascii=False) + "\n"
+        writeFileAtomic(filepath, record.encode('utf-8'))
+        self._journals[filepath] = [state, 0, _fileStamp(filepath)]
+
+    @staticmethod
+    def readSave(filepath: str) -> dict:
+        if filepath.endswith(JOURNAL_EXT):
+            state, _ = readJournal(filepath)
+            return state
+        with open(filepath, 'r') as f:
+            return json.load(f)
+
+    @staticmethod
+    def loadCharacter(filepath: str) -> Character:
+        if filepath.endswith(BINARY_EXT):
+            with open(filepath, 'rb') as f:
+                return decodeCharacter(f.read())
+        return _deserialize_character(SaveGame.readSave(filepath))
+
+    def convertToBinary(self, filepath: str, remove_source: bool = False) -> str:
+        """Migrates a JSON or journal save to the binary format and returns the new path."""
+        character = self.loadCharacter(filepath)
+        binary_path = self.binaryPath(character.name, character.type)
+        writeFileAtomic(binary_path, encodeCharacter(character, self.compress))
+
+        self.manifest.remove(os.path.basename(filepath))
+        self.manifest.record(binary_path, character.name, character.type, character.level, os.path.getmtime(filepath))
+        if remove_source:
+            os.remove(filepath)
+        return binary_path
+
+    def importSaves(self) -> int:
+        """Bulk imports every save file of the saves directory into the database."""
+        if self.database is None:
+            raise ValueError("importSaves requires the sqlite save format")
+
+        def states():
+            for filename in os.listdir(self.saves_dir):
+                if not filename.endswith(SAVE_EXTENSIONS) or filename == MANIFEST_FILE:
+                    continue
+                filepath = os.path.join(self.saves_dir, filename)
+                try:
+                    yield toPlainData(self.loadCharacter(filepath)), os.path.getmtime(filepath)
+                except (OSError, ValueError, KeyError, TypeError):
+                    write("Skipping unreadable save {}", filename)
+
+        return self.database.importStates(states())
+
+    def load(self, character_name: str = None) -> Character | None:
+        """Affiche les 5 dernieres sauvegardes (du personnage donne, sinon de tous) et charge celle choisie."""
+        if self.database is not None:
+            last_saves = self.database.latest(5, character_name)
+        else:
+            last_saves = self.manifest.latest(5, character_name)
+
+        if not last_saves:
+            write("No save files found.")
             return None
 
-        last_saves = save_files[:5]
         labels = []
-        for f in last_saves:
-            display_name = f.replace('.json', '').replace('_save-', ' | ')
-            labels.append(display_name)
+        for entry in last_saves:
+            date = datetime.fromtimestamp(entry["timestamp"]).strftime('%d-%m-%Y %H:%M:%S')
+            labels.append(f"{entry['name']} ({entry['type']}) - Level {entry['level']} | {date}")
 
         choice = inputMenu("Choose a save to load", labels + ["Back"])
 
         if choice == len(labels) + 1:
             return None
 
-        selected_file = last_saves[choice - 1]
-        filepath = os.path.join(SAVES_DIR, selected_file)
-
-        with open(filepath, 'r') as f:
-            data = json.load(f)
-
-        character = _deserialize_character(data)
-        print(f"\nSave loaded: {character.name} ({character.type}) - Level {character.level}")
+        selected = last_saves[choice - 1]
+        if self.database is not None:
+            character = _deserialize_character(self.database.loadState(selected["name"], selected["type"]))
+        else:
+            filepath = os.path.join(self.saves_dir, selected["path"])
+            try:
+                character = self.loadCharacter(filepath)
+            except OSError:
+                write("Save file {} is missing.", selected["path"])
+                self.manifest.remove(selected["path"])
+                return None
+        write("\nSave loaded: {} ({}) - Level {}", character.name, character.type, character.level)
         character.displayStats()
-        return character
\ No newline at end of file
+        return character
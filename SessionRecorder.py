@@ -0,0 +1,43 @@
+import hashlib
+import json
+from GameEngine import GameEngine
+from entity.Character import Character
+from SaveGame import toPlainData, writeFileAtomic
+
+RECORDING_VERSION = 1
+
+
+def finalState(engine: GameEngine) -> dict:
+    """What a replay must reproduce: the engine state, the full character and the random stream position."""
+    state = {
+        "engine": engine.state(),
+        "character": toPlainData(engine.character),
+        "rng": hashlib.sha256(repr(engine.rng.getstate()).encode()).hexdigest()
+    }
+    # Meme forme que relu depuis le JSON (tuples -> listes)
+    return json.loads(json.dumps(state))
+
+
+class SessionRecorder:
+    """Records a play session as its seed, starting character and chosen actions.
+
+    The starting character is captured before createEngine() adds the starter
+    items, so Replay.replay() rebuilds the session exactly as main.buildGame() did.
+    """
+
+    def __init__(self, path: str, character: Character, seed: int):
+        self.path = path
+        self.recording = {
+            "version": RECORDING_VERSION,
+            "seed": seed,
+            "character": toPlainData(character),
+            "actions": [],
+            "final": None
+        }
+
+    def record(self, action: str) -> None:
+        self.recording["actions"].append(action)
+
+    def finish(self, engine: GameEngine) -> None:
+        self.recording["final"] = finalState(engine)
+        writeFileAtomic(self.path, json.dumps(self.recording, ensure_ascii=False).encode('utf-8'))
@@ -1,10 +1,62 @@
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Iterable, Optional
+from Renderer import write, isEnabled
+from item.Item import ModifierType
 
 if TYPE_CHECKING:
     from entity.Character import Character
     from item.Item import Item
 
+STAT_NAMES = ('hp', 'hpMax', 'strength', 'defense', 'intelligence', 'agility', 'critChance')
+STAT_INDEX = {stat_name: index for index, stat_name in enumerate(STAT_NAMES)}
+# Change a chaque coup : recalcule a chaque lecture plutot que de payer l'invalidation a chaque ecriture
+UNCACHED_STATS = frozenset({'hp'})
+
+
+class ModifierStack:
+    """Item modifiers compiled into flat per-stat ADD and PERCENTAGE totals.
+
+    Resolving a stat is a single pass whatever the number of modifiers:
+    base + every ADD, then the summed percentages of the base value.
+    """
+    def __init__(self, items: Iterable[Optional["Item"]] = ()):
+        self.adds = [0] * len(STAT_NAMES)
+        self.percentages = [0] * len(STAT_NAMES)
+        self.items = []
+        # Stats outside STAT_NAMES : stat_name -> [add, percentage]
+        self.extra = {}
+        
+        for item in items:
+            if item is not None:
+                self.addModifier(item)
+    
+    def addModifier(self, item: "Item") -> None:
+        self.items.append(item)
+        is_add = item.modifier_type == ModifierType.ADD
+        
+        for stat_name in item.affected_stats:
+            index = STAT_INDEX.get(stat_name)
+            if index is None:
+                totals = self.extra.setdefault(stat_name, [0, 0])
+                totals[0 if is_add else 1] += item.value
+            elif is_add:
+                self.adds[index] += item.value
+            else:
+                self.percentages[index] += item.value
+    
+    def resolve(self, stat_name: str, base_value: int) -> int:
+        index = STAT_INDEX.get(stat_name)
+        if index is None:
+            add, percentage = self.extra.get(stat_name, (0, 0))
+        else:
+            add, percentage = self.adds[index], self.percentages[index]
+        
+        final_value = base_value + add
+        if percentage > 0:
+            final_value += int(base_value * (percentage / 100))
+        return final_value
+
+
 class CharacterDecorator(ABC):
     def __init__(self, character: "Character"):
         self._character = character
@@ -20,72 +72,76 @@ class BaseCharacterWrapper(CharacterDecorator):
 
 
 class StatModifierDecorator(CharacterDecorator):
+    """Adds an item's modifier on top of a character or of another decorator.
+
+    Wrapping a decorator does not build a chain : the layers are flattened
+    into one ModifierStack over the undecorated character.
+    """
     def __init__(self, character: "Character", item: "Item"):
+        items = [item]
+        if isinstance(character, StatModifierDecorator):
+            items = character.stack.items + items
+        if isinstance(character, CharacterDecorator):
+            character = character._character
+        
         super().__init__(character)
         self.item = item
-        self._base_decorator = None
+        self.stack = ModifierStack(items)
     
     def getStat(self, stat_name: str):
-        base_value = getattr(self._character, stat_name, 0)
-        
-        if stat_name not in self.item.affected_stats:
-            return base_value
-        
-        from item.Item import ModifierType
-        if self.item.modifier_type == ModifierType.ADD:
-            return base_value + self.item.value
-        elif self.item.modifier_type == ModifierType.PERCENTAGE:
-            return base_value + int(base_value * (self.item.value / 100))
-        
-        return base_value
+        return self.stack.resolve(stat_name, getattr(self._character, stat_name, 0))
 
 
 class StatCalculator:
+    @staticmethod
+    def getCachedStat(character: "Character", stat_name: str) -> int:
+        """Returns the effective stat from the character's cache, computing it on a miss.
+
+        The cache is dropped when the inventory equipment version changes, and
+        Character.__setattr__ evicts entries when base stats or level change.
+        UNCACHED_STATS are resolved on every call.
+        """
+        cache = character._stat_cache
+        inventory = character.inventory
+        if character._stat_cache_version != inventory._equipment_version:
+            cache.clear()
+            character._stat_cache_version = inventory._equipment_version
+            character._modifier_stack = StatCalculator.compileModifiers(inventory)
+        
+        if stat_name in UNCACHED_STATS:
+            return character._modifier_stack.resolve(stat_name, getattr(character, stat_name, 0))
+        value = cache.get(stat_name)
+        if value is None:
+            value = cache[stat_name] = character._modifier_stack.resolve(stat_name, getattr(character, stat_name, 0))
+        return value
+    
+    @staticmethod
+    def compileModifiers(inventory) -> ModifierStack:
+        return ModifierStack((inventory.equipped_weapon, inventory.equipped_armor))
+    
     @staticmethod
     def calculateStat(character: "Character", stat_name: str) -> int:
         if not hasattr(character, 'inventory'):
             return getattr(character, stat_name, 0)
         
-        inventory = character.inventory
-        base_value = getattr(character, stat_name, 0)
-        total_modifier = 0
-        percentage_modifier = 0
-        
-        if inventory.equipped_weapon and stat_name in inventory.equipped_weapon.affected_stats:
-            from item.Item import ModifierType
-            if inventory.equipped_weapon.modifier_type == ModifierType.ADD:
-                total_modifier += inventory.equipped_weapon.value
-            else:
-                percentage_modifier += inventory.equipped_weapon.value
-        
-        if inventory.equipped_armor and stat_name in inventory.equipped_armor.affected_stats:
-            from item.Item import ModifierType
-            if inventory.equipped_armor.modifier_type == ModifierType.ADD:
-                total_modifier += inventory.equipped_armor.value
-            else:
-                percentage_modifier += inventory.equipped_armor.value
-        
-        final_value = base_value + total_modifier
-        if percentage_modifier > 0:
-            final_value += int(base_value * (percentage_modifier / 100))
-        
-        return final_value
+        stack = StatCalculator.compileModifiers(character.inventory)
+        return stack.resolve(stat_name, getattr(character, stat_name, 0))
     
     @staticmethod
     def getAllStats(character: "Character") -> dict:
-        stats = {}
-        stat_names = ['hp', 'hpMax', 'strength', 'defense', 'intelligence', 'agility', 'critChance']
-        
-        for stat_name in stat_names:
-            stats[stat_name] = StatCalculator.calculateStat(character, stat_name)
-        
-        return stats
+        if not hasattr(character, 'getEffectiveStat'):
+            return {stat_name: StatCalculator.calculateStat(character, stat_name) for stat_name in STAT_NAMES}
+        return {stat_name: character.getEffectiveStat(stat_name) for stat_name in STAT_NAMES}
     
     @staticmethod
     def displayStats(character: "Character"):        
-        print(f"\nStats of {character.name} (Level {character.level})")
-        print("=" * 50)
+        if not isEnabled():
+            return
+        
+        write("\nStats of {} (Level {})", character.name, character.level)
+        write("=" * 50)
         
+        stats = StatCalculator.getAllStats(character)
         stat_names = {
             'hp': 'Health Points',
             'hpMax': 'Max HP',
@@ -101,35 +157,35 @@ class StatCalculator:
                 continue  # On affiche HP avec hpMax
             
             base_value = getattr(character, stat_key, 0)
-            modified_value = StatCalculator.calculateStat(character, stat_key)
+            modified_value = stats[stat_key]
             
             if stat_key == 'hpMax':
                 current_hp = character.hp
                 max_hp = modified_value
                 bonus = modified_value - base_value
                 if bonus > 0:
-                    print(f"  {stat_label:.<20} {current_hp}/{max_hp} (+{bonus})")
+                    write("  {:.<20} {}/{} (+{})", stat_label, current_hp, max_hp, bonus)
                 else:
-                    print(f"  {stat_label:.<20} {current_hp}/{max_hp}")
+                    write("  {:.<20} {}/{}", stat_label, current_hp, max_hp)
             else:
                 if modified_value != base_value:
                     bonus = modified_value - base_value
-                    print(f"  {stat_label:.<20} {modified_value} (+{bonus})")
+                    write("  {:.<20} {} (+{})", stat_label, modified_value, bonus)
                 else:
-                    print(f"  {stat_label:.<20} {modified_value}")
+                    write("  {:.<20} {}", stat_label, modified_value)
         
-        print("=" * 50)
+        write("=" * 50)
         
         if hasattr(character, 'inventory'):
             inventory = character.inventory
-            print("\nEquipment:")
+            write("\nEquipment:")
             if inventory.equipped_weapon:
-                print(f"  Weapon: {inventory.equipped_weapon.getDescription()}")
+                write("  Weapon: {}", inventory.equipped_weapon.getDescription())
             else:
-                print(f"  Weapon: None")
+                write("  Weapon: None")
             
             if inventory.equipped_armor:
-                print(f"  Armor: {inventory.equipped_armor.getDescription()}")
+                write("  Armor: {}", inventory.equipped_armor.getDescription())
             else:
-                print(f"  Armor: None")
-            print()
+                write("  Armor: None")
+            write("")
@@ -1,11 +1,14 @@
+from Renderer import write, flush
+
 def inputMenu(prompt: str, options: list) -> int:
     """Displays a menu with the given prompt and options, and returns the user's choice as an integer."""
     while True:
-        print(prompt)
+        write(prompt)
         for i, option in enumerate(options, 1):
-            print(f"{i} - {option}")
+            write("{} - {}", i, option)
+        flush()
         choice = input("Enter your choice: ")
         if choice.isdigit() and 1 <= int(choice) <= len(options):
             return int(choice)
         else:
-            print("Invalid choice. Please try again.")
+            write("Invalid choice. Please try again.")
@@ -1,7 +1,16 @@
-from StatModifier import StatCalculator
+from StatModifier import STAT_NAMES, UNCACHED_STATS, StatCalculator
 from inventory.Inventory import Inventory
+from Renderer import write
+
+# Attributs dont depend le cache de stats, les autres (hp, xp...) s'ecrivent sans invalidation
+STAT_ATTRIBUTES = frozenset(STAT_NAMES).difference(UNCACHED_STATS) | {'level', 'inventory'}
 
 class Character:
+    # Pas de __dict__ : les attributs publics sont ceux de PUBLIC_FIELDS, sauvegardes par toDict()
+    PUBLIC_FIELDS = ('name', 'level', 'xp', 'type', 'hp', 'hpMax', 'strength', 'defense', 'intelligence',
+                     'agility', 'critChance', 'seed', 'inventory')
+    __slots__ = ('_stat_cache', '_stat_cache_version', '_modifier_stack') + PUBLIC_FIELDS
+
     def __init__(
             self, 
             name:str,
@@ -16,6 +25,9 @@ class Character:
             agility:int = 30,
             critChance:int = 0
         ):
+        self._stat_cache = {}
+        self._stat_cache_version = -1
+        self._modifier_stack = None
         self.name = name
         self.level = level
         self.xp = xp
@@ -27,20 +39,40 @@ class Character:
         self.intelligence = intelligence
         self.agility = agility
         self.critChance = critChance
+        # Graine du flux aleatoire de la partie, enregistree pour pouvoir la rejouer
+        self.seed = None
 
         self.inventory = Inventory()
     
+    def __setattr__(self, name: str, value) -> None:
+        object.__setattr__(self, name, value)
+        if name not in STAT_ATTRIBUTES:
+            return
+        if name == 'inventory':
+            # Le nouvel inventaire peut avoir la meme version d'equipement que l'ancien
+            object.__setattr__(self, '_stat_cache_version', -1)
+            object.__setattr__(self, '_modifier_stack', None)
+        try:
+            cache = self._stat_cache
+        except AttributeError:
+            return
+        if cache:
+            if name in cache:
+                del cache[name]
+            elif name in ('level', 'inventory'):
+                cache.clear()
+    
     def getEffectiveStat(self, stat_name: str) -> int:
-        return StatCalculator.calculateStat(self, stat_name)
+        return StatCalculator.getCachedStat(self, stat_name)
+    
+    def toDict(self) -> dict:
+        return {field: getattr(self, field) for field in self.PUBLIC_FIELDS}
     
     def displayStats(self):
         StatCalculator.displayStats(self)
 
     def attack(self):
         pass
-    
-    def defense(self):
-        pass
 
     def skill1(self):
         pass
@@ -51,18 +83,19 @@ class Character:
 
 
 class Warrior(Character):
+    __slots__ = ()
 
     def __init__(self, name):
         return super().__init__(name=name, type="Warrior", defense=12, hp=120, hpMax=120, strength=25, critChance=5)
     
     def attack(self, enemy):
-        print(f"{self.name} lvl {self.level} attacks {enemy.name}!")
+        write("{} lvl {} attacks {}!", self.name, self.level, enemy.name)
         # Utilise les stats effectives (base + équipement)
         effective_strength = self.getEffectiveStat('strength')
         effective_defense = enemy.getEffectiveStat('defense') if hasattr(enemy, 'getEffectiveStat') else enemy.defense
         damage = max(0, effective_strength - effective_defense)
         enemy.hp -= damage
-        print(f"{enemy.name} takes {damage} damage! (HP: {enemy.hp}/{enemy.hpMax})")
+        write("{} takes {} damage! (HP: {}/{})", enemy.name, damage, enemy.hp, enemy.hpMax)
         return enemy
     
 
@@ -74,18 +107,19 @@ class Warrior(Character):
 
 
 class Mage(Character):
+    __slots__ = ()
 
     def __init__(self, name):
         return super().__init__(name=name, type="Mage", defense=5, hp=80, hpMax=80, intelligence=30, strength=10)
     
     def attack(self, enemy):
-        print(f"{self.name} lvl {self.level} casts a spell on {enemy.name}!")
+        write("{} lvl {} casts a spell on {}!", self.name, self.level, enemy.name)
         # Utilise l'intelligence pour les mages
         effective_intelligence = self.getEffectiveStat('intelligence')
         effective_defense = enemy.getEffectiveStat('defense') if hasattr(enemy, 'getEffectiveStat') else enemy.defense
         damage = max(0, effective_intelligence - effective_defense)
         enemy.hp -= damage
-        print(f"{enemy.name} takes {damage} magical damage! (HP: {enemy.hp}/{enemy.hpMax})")
+        write("{} takes {} magical damage! (HP: {}/{})", enemy.name, damage, enemy.hp, enemy.hpMax)
         return enemy
     
 
@@ -97,19 +131,20 @@ class Mage(Character):
 
 
 class Thief(Character):
+    __slots__ = ()
 
     def __init__(self, name):
         return super().__init__(name=name, type="Thief", defense=8, hp=100, hpMax=100, agility=25, strength=18, critChance=15)
     
     def attack(self, enemy):
-        print(f"{self.name} lvl {self.level} strikes {enemy.name} swiftly!")
+        write("{} lvl {} strikes {} swiftly!", self.name, self.level, enemy.name)
         # Utilise l'agilité + force pour les voleurs
         effective_agility = self.getEffectiveStat('agility')
         effective_strength = self.getEffectiveStat('strength')
         effective_defense = enemy.getEffectiveStat('defense') if hasattr(enemy, 'getEffectiveStat') else enemy.defense
         damage = max(0, (effective_strength + effective_agility // 2) - effective_defense)
         enemy.hp -= damage
-        print(f"{enemy.name} takes {damage} damage! (HP: {enemy.hp}/{enemy.hpMax})")
+        write("{} takes {} damage! (HP: {}/{})", enemy.name, damage, enemy.hp, enemy.hpMax)
         return enemy
     
 
@@ -1,6 +1,23 @@
+import json
+import os
 import random
+from typing import Dict, List, Tuple
+from Renderer import write
+
+ENEMIES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "enemies.json")
+# Les courbes de stats sont precalculees jusqu'a ce niveau, au-dela elles sont calculees a la demande
+MAX_TABLE_LEVEL = 100
+# Ordre des stats dans les tables (hpMax = hp)
+STATS = ("hp", "strength", "defense", "minNumberOfAttacks", "maxNumberOfAttacks")
+STAT_DEFAULTS = {"minNumberOfAttacks": 1, "maxNumberOfAttacks": 1}
+# Ennemis gardes par type pour etre reutilises : pas de pool par defaut, POOL_SIZE quand on l'active
+DEFAULT_POOL_SIZE = 0
+POOL_SIZE = 64
 
 class Enemy:
+    __slots__ = ('name', 'level', 'type', 'hp', 'hpMax', 'strength', 'defense', 'minNumberOfAttacks',
+                 'maxNumberOfAttacks', 'attackTypeResistance', 'rng')
+
     def __init__(
         self,
         name: str,
@@ -13,6 +30,7 @@ class Enemy:
         minNumberOfAttacks: int = 1,
         maxNumberOfAttacks: int = 1,
         attackTypeResistance: list = None,
+        rng: random.Random = random,
     ):
         self.name = name
         self.level = level
@@ -24,16 +42,29 @@ class Enemy:
         self.minNumberOfAttacks = minNumberOfAttacks
         self.maxNumberOfAttacks = maxNumberOfAttacks
         self.attackTypeResistance = attackTypeResistance if attackTypeResistance is not None else []
+        self.rng = rng
+
+    def reset(self, level: int, stats: tuple, attackTypeResistance: list, rng: random.Random = random) -> None:
+        """Puts a pooled enemy back in its freshly spawned state, without allocating.
+
+        stats is (hp, strength, defense, minNumberOfAttacks, maxNumberOfAttacks), see STATS.
+        """
+        self.level = level
+        self.hp, self.strength, self.defense, self.minNumberOfAttacks, self.maxNumberOfAttacks = stats
+        self.hpMax = self.hp
+        if self.attackTypeResistance != attackTypeResistance:
+            self.attackTypeResistance[:] = attackTypeResistance
+        self.rng = rng
 
     def attack(self, character):
-        print(f"{self.name} lvl {self.level} attacks {character.name}!")
+        write("{} lvl {} attacks {}!", self.name, self.level, character.name)
         damage = max(0, self.strength - character.defense)
         character.hp -= damage
-        print(f"{character.name} takes {damage} damage! (HP: {character.hp}/{character.hpMax})")
+        write("{} takes {} damage! (HP: {}/{})", character.name, damage, character.hp, character.hpMax)
         return character
     
     def defend(self, character):
-        print(f"{self.name} lvl {self.level} defend from {character.name} attack!")
+        write("{} lvl {} defend from {} attack!", self.name, self.level, character.name)
     
     def skill1(self, character):
         return character
@@ -41,66 +72,73 @@ class Enemy:
     def skill2(self, character):
         return character
 
+# Les classes ne portent que le comportement, les stats viennent de enemies.json
+
 class Wolf(Enemy):
-    def __init__(self, level: int):
-        super().__init__(name="Wolf", level=level, type="Beast", hp=40 + (level * 8), hpMax=40 + (level * 8), strength=12 + (level * 2), defense=3 + level, minNumberOfAttacks=1, maxNumberOfAttacks=1 + (level // 3))
-    
+    __slots__ = ()
+
     def attack(self, character):
         number_of_attacks = self._roll_number_of_attacks()
-        print(f"{self.name} lvl {self.level} attacks {character.name} {number_of_attacks} time(s)!")
+        write("{} lvl {} attacks {} {} time(s)!", self.name, self.level, character.name, number_of_attacks)
 
         for _ in range(number_of_attacks):
             super().attack(character)
         return character
     
     def _roll_number_of_attacks(self):
-        return random.randint(self.minNumberOfAttacks, self.maxNumberOfAttacks)
+        return self.rng.randint(self.minNumberOfAttacks, self.maxNumberOfAttacks)
 
 class Bandit(Enemy):
-    def __init__(self, level: int):
-        super().__init__(name="Bandit", level=level, type="Human", hp=50 + (level * 10), hpMax=50 + (level * 10), strength=14 + (level * 3), defense=6 + (level * 2))
-    
+    __slots__ = ()
+
     def attack(self, character):
-        chance_to_steal = random.random() < 0.01 * self.level # 1% chance to steal per level
+        chance_to_steal = self.rng.random() < 0.01 * self.level # 1% chance to steal per level
         
         if chance_to_steal:
-            print(f"{self.name} steals from {character.name}!") # TODO : Implement stealing logic here (e.g., reduce character's gold or items)
+            write("{} steals from {}!", self.name, character.name) # TODO : Implement stealing logic here (e.g., reduce character's gold or items)
         else:
             super().attack(character)
         
         return character
 
 class Skeleton(Enemy):
-    def __init__(self, level: int):
-        super().__init__(name="Skeleton", level=level, type="Skeleton", hp=45 + (level * 10), hpMax=45 + (level * 10), strength=10 + (level * 2), defense=8 + (level * 2), attackTypeResistance=["Physical"])
+    __slots__ = ()
 
 class CorruptedChampion(Enemy):
-    def __init__(self, level: int):
-        super().__init__(name="Corrupted Champion", level=level, type="Demon", hp=80 + (level * 15), hpMax=80 + (level * 15), strength=18 + (level * 4), defense=10 + (level * 2))
-    
+    __slots__ = ()
+
     def skill1(self, character):
         damage = max(0, (self.strength * 1.5) - character.defense)
         character.hp -= damage
-        print(f"{character.name} takes {damage} damage from Corrupted Strike! (HP: {character.hp}/{character.hpMax})")
+        write("{} takes {} damage from Corrupted Strike! (HP: {}/{})", character.name, damage, character.hp, character.hpMax)
         return character
 
 class Boss(Enemy):
-    def __init__(self, level: int):
+    __slots__ = ('boss_phase',)
+
+    def __init__(self, name: str, level: int, type: str, hp: int, hpMax: int, strength: int, defense: int,
+                 minNumberOfAttacks: int = 1, maxNumberOfAttacks: int = 1, attackTypeResistance: list = None,
+                 rng: random.Random = random):
+        self.boss_phase = 1
+        super().__init__(name, level, type, hp, hpMax, strength, defense, minNumberOfAttacks, maxNumberOfAttacks,
+                         attackTypeResistance, rng)
+
+    def reset(self, level: int, stats: tuple, attackTypeResistance: list, rng: random.Random = random) -> None:
+        Enemy.reset(self, level, stats, attackTypeResistance, rng)
         self.boss_phase = 1
-        super().__init__(name="Boss", level=level, type="Boss", hp=150 + (level * 30), hpMax=150 + (level * 30), strength=25 + (level * 5), defense=15 + (level * 3))
 
     def skill1(self, character):
         damage = max(0, (self.strength * 2) - character.defense)
         character.hp -= damage
-        print(f"{character.name} takes {damage} damage from Boss's powerful strike! (HP: {character.hp}/{character.hpMax})")
+        write("{} takes {} damage from Boss's powerful strike! (HP: {}/{})", character.name, damage, character.hp, character.hpMax)
         return character
 
     def skill2(self, character):
         if (self.boss_phase == 1):
-            print(f"{self.name} tries to use a sweeping attack, but it's not effective in phase 1!")
+            write("{} tries to use a sweeping attack, but it's not effective in phase 1!", self.name)
         damage = max(0, (self.strength * 1.5) - character.defense)
         character.hp -= damage
-        print(f"{character.name} takes {damage} damage from Boss's sweeping attack! (HP: {character.hp}/{character.hpMax})")
+        write("{} takes {} damage from Boss's sweeping attack! (HP: {}/{})", character.name, damage, character.hp, character.hpMax)
         return character
 
     def check_phase_transition(self):
@@ -108,19 +146,142 @@ class Boss(Enemy):
             self.boss_phase = 2
             self.strength += 10
             self.defense += 5
-            print(f"{self.name} enrages and enters phase 2! Strength and defense increased!")
+            write("{} enrages and enters phase 2! Strength and defense increased!", self.name)
+
+# Valeurs possibles de "behaviour" dans enemies.json
+BEHAVIOURS = {
+    "Enemy": Enemy,
+    "Wolf": Wolf,
+    "Bandit": Bandit,
+    "Skeleton": Skeleton,
+    "CorruptedChampion": CorruptedChampion,
+    "Boss": Boss
+}
+
+class EnemyTemplate:
+    """One enemy type of enemies.json, with its stats precomputed for every level.
+
+    A stat curve is base + perLevel * (level // every), every defaulting to 1.
+    """
+    def __init__(self, data: dict):
+        self.name = data["name"]
+        self.type = data["type"]
+        behaviour = data.get("behaviour", "Enemy")
+        if behaviour not in BEHAVIOURS:
+            raise ValueError(f"Unknown behaviour '{behaviour}' for enemy '{self.name}'")
+        self.behaviour = BEHAVIOURS[behaviour]
+        self.attackTypeResistance = tuple(data.get("attackTypeResistance", ()))
+        # Meme type que sur l'ennemi, pour comparer sans copier au reset
+        self._resistances = list(self.attackTypeResistance)
+        self.curves = [data["stats"].get(stat, {"base": STAT_DEFAULTS.get(stat, 0)}) for stat in STATS]
+        self.table: List[Tuple[int, ...]] = [self._computeStats(level) for level in range(MAX_TABLE_LEVEL + 1)]
+
+    def _computeStats(self, level: int) -> Tuple[int, ...]:
+        return tuple(curve["base"] + curve.get("perLevel", 0) * (level // curve.get("every", 1)) for curve in self.curves)
+
+    def statsAt(self, level: int) -> Tuple[int, ...]:
+        if 0 <= level <= MAX_TABLE_LEVEL:
+            return self.table[level]
+        return self._computeStats(level)
+
+    def create(self, level: int, rng: random.Random = random) -> Enemy:
+        table = self.table
+        hp, strength, defense, min_attacks, max_attacks = table[level] if 0 <= level < len(table) else self._computeStats(level)
+        return self.behaviour(self.name, level, self.type, hp, hp, strength, defense, min_attacks, max_attacks,
+                              list(self.attackTypeResistance), rng)
+
+    def reset(self, enemy: Enemy, level: int, rng: random.Random = random) -> Enemy:
+        table = self.table
+        enemy.reset(level, table[level] if 0 <= level < len(table) else self._computeStats(level),
+                    self._resistances, rng)
+        return enemy
+
+_templates: Dict[str, Dict[str, EnemyTemplate]] = {}
+
+def loadEnemyTemplates(enemies_file: str = ENEMIES_FILE) -> Dict[str, EnemyTemplate]:
+    """Enemy name -> template, read and tabulated once per file."""
+    templates = _templates.get(enemies_file)
+    if templates is None:
+        with open(enemies_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        templates = {}
+        for enemy_data in data["enemies"]:
+            template = EnemyTemplate(enemy_data)
+            templates[template.name] = template
+        _templates[enemies_file] = templates
+    return templates
+
+class EnemyPool:
+    """Free enemies per type, reused instead of spawning new ones.
+
+    An enemy comes back through release() once its fight is over and is
+    reset (stats, hp, resistances, boss phase) by the next acquire(). At most
+    max_size enemies are kept per type, the others are left to the GC.
+    """
+    def __init__(self, max_size: int = POOL_SIZE):
+        self.max_size = max_size
+        self._free: Dict[str, List[Enemy]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.released = 0
+        self.discarded = 0
+
+    def acquire(self, template: EnemyTemplate, level: int, rng: random.Random = random) -> Enemy:
+        free = self._free.get(template.name)
+        if free:
+            self.hits += 1
+            enemy = free.pop()
+            template.reset(enemy, level, rng)
+            return enemy
+        self.misses += 1
+        return template.create(level, rng)
+
+    def release(self, enemy: Enemy) -> None:
+        free = self._free.get(enemy.name)
+        if free is None:
+            free = self._free[enemy.name] = []
+        elif len(free) >= self.max_size:
+            self.discarded += 1
+            return
+        # Le flux du combat ne doit pas rester reference par un ennemi libre
+        enemy.rng = random
+        free.append(enemy)
+        self.released += 1
+
+    def stats(self) -> dict:
+        requests = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / requests if requests else 0.0,
+            "released": self.released,
+            "discarded": self.discarded,
+            "free": sum(len(free) for free in self._free.values())
+        }
 
 class EnemyFactory:
-    def create_enemy(self, enemy_type: str, level: int) -> Enemy:
-        if enemy_type == "Wolf":
-            return Wolf(level)
-        elif enemy_type == "Bandit":
-            return Bandit(level)
-        elif enemy_type == "Skeleton":
-            return Skeleton(level)
-        elif enemy_type == "Corrupted Champion":
-            return CorruptedChampion(level)
-        elif enemy_type == "Boss":
-            return Boss(level)
-        else:
-            raise ValueError(f"Unknown enemy type: {enemy_type}")
\ No newline at end of file
+    """Creates enemies from the types of enemies.json: a table lookup and one instance.
+
+    With pool_size > 0 (e.g. POOL_SIZE), enemies handed back with release()
+    are recycled by the factory's pool; without one release() does nothing.
+    """
+    def __init__(self, enemies_file: str = ENEMIES_FILE, pool_size: int = DEFAULT_POOL_SIZE):
+        self.templates = loadEnemyTemplates(enemies_file)
+        self.pool = EnemyPool(pool_size) if pool_size > 0 else None
+
+    def enemyTypes(self) -> List[str]:
+        return list(self.templates)
+
+    def create_enemy(self, enemy_type: str, level: int, rng: random.Random = random) -> Enemy:
+        template = self.templates.get(enemy_type)
+        if template is None:
+            raise ValueError(f"Unknown enemy type: {enemy_type}")
+        if self.pool is not None:
+            return self.pool.acquire(template, level, rng)
+        return template.create(level, rng)
+
+    def release(self, enemy: Enemy) -> None:
+        """Gives back an enemy whose fight is over, it must not be used afterwards."""
+        template = self.templates.get(enemy.name)
+        if self.pool is not None and template is not None and type(enemy) is template.behaviour:
+            self.pool.release(enemy)
\ No newline at end of file
@@ -0,0 +1,109 @@
+import gc
+import random
+import time
+import tracemalloc
+from typing import Callable
+from entity.EnemyFactory import POOL_SIZE, EnemyFactory
+from StatModifier import STAT_NAMES
+from save.SaveBenchmark import buildSampleCharacter
+from Renderer import NullSink, useSink, write, flush
+
+
+def bytesPerObject(create: Callable[[], object], count: int) -> float:
+    """Mean traced memory kept alive by one object returned by create()."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [create() for _ in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # La liste elle-meme n'est pas comptee
+    return (after - before - objects.__sizeof__()) / count
+
+
+def fullCharacter():
+    character = buildSampleCharacter()
+    # Un personnage en jeu a aussi son cache de stats rempli
+    for stat_name in STAT_NAMES:
+        character.getEffectiveStat(stat_name)
+    return character
+
+
+def benchmarkMemory(count: int = 10000) -> dict:
+    """Bytes per character with a full inventory, and per spawned enemy of every type."""
+    factory = EnemyFactory()
+    rng = random.Random(0)
+    # Charge le catalogue avant de mesurer
+    fullCharacter()
+
+    results = {"character (full inventory)": bytesPerObject(fullCharacter, count // 10)}
+    for enemy_type in factory.enemyTypes():
+        results[f"enemy: {enemy_type}"] = bytesPerObject(lambda: factory.create_enemy(enemy_type, 5, rng), count)
+    return results
+
+
+def benchmarkEnemyPool(fights: int = 20000, pool_size: int = POOL_SIZE, seed: int = 0) -> dict:
+    """Runs the same seeded fights with an EnemyFactory of the given pool size (0 = no pool).
+
+    Reports the enemies actually allocated, the garbage collections triggered
+    and their total pause, and the time to spawn and give back one enemy.
+    """
+    from CombatSimulator import run_fight
+    from RngStream import RngStream
+
+    factory = EnemyFactory(pool_size=pool_size)
+    rng = RngStream(seed)
+    enemy_types = factory.enemyTypes()
+    pauses = []
+    started = {}
+
+    def onCollect(phase, info):
+        if phase == "start":
+            started["at"] = time.perf_counter()
+        else:
+            pauses.append(time.perf_counter() - started["at"])
+
+    gc.collect()
+    before = [generation["collections"] for generation in gc.get_stats()]
+    gc.callbacks.append(onCollect)
+    start = time.perf_counter()
+    try:
+        for i in range(fights):
+            run_fight("Warrior", 5, enemy_types[i % len(enemy_types)], 5, rng=rng, enemy_factory=factory)
+    finally:
+        gc.callbacks.remove(onCollect)
+    elapsed = time.perf_counter() - start
+    after = [generation["collections"] for generation in gc.get_stats()]
+
+    spawns = 100000
+    spawn_start = time.perf_counter()
+    for i in range(spawns):
+        factory.release(factory.create_enemy(enemy_types[i % len(enemy_types)], 5, rng))
+    spawn_us = (time.perf_counter() - spawn_start) / spawns * 1e6
+
+    pool = factory.pool.stats() if factory.pool else None
+    return {
+        "seconds": elapsed,
+        "allocated": pool["misses"] if pool else fights + spawns,
+        "spawn_us": spawn_us,
+        "collections": [b - a for a, b in zip(before, after)],
+        "gc_ms": sum(pauses) * 1000,
+        "pool": pool
+    }
+
+
+if __name__ == "__main__":
+    with useSink(NullSink()):
+        results = benchmarkMemory()
+        pools = {"no pool": benchmarkEnemyPool(pool_size=0), "pool": benchmarkEnemyPool()}
+    write("{:<30}{:>8}", "object", "bytes")
+    for label, size in results.items():
+        write("{:<30}{:>8.0f}", label, size)
+
+    write("\n{:<10}{:>9}{:>9}{:>6}{:>6}{:>6}{:>8}{:>10}{:>10}",
+          "20k fights", "seconds", "enemies", "gen0", "gen1", "gen2", "gc ms", "spawn us", "hit rate")
+    for label, result in pools.items():
+        hit_rate = f"{result['pool']['hit_rate']:.1%}" if result["pool"] else "-"
+        write("{:<10}{:>9.2f}{:>9}{:>6}{:>6}{:>6}{:>8.1f}{:>10.2f}{:>10}", label, result["seconds"], result["allocated"],
+              *result["collections"][:3], result["gc_ms"], result["spawn_us"], hit_rate)
+    flush()
@@ -1,169 +1,255 @@
-from typing import Optional, List
+from typing import Dict, Optional, List
 from item.Item import Item, Weapon, Armor, Consumable, ItemType
+from Renderer import write, isEnabled
 
 class Inventory:   
     MAX_SLOTS = 10
+    __slots__ = ('_slots', '_buckets', '_stacks', '_names', 'equipped_weapon', 'equipped_armor', '_equipment_version')
     
     def __init__(self):
-        self.items: List[Item] = []
+        # id(item) -> item, in insertion order, plus the same slots split per ItemType
+        self._slots: Dict[int, Item] = {}
+        self._buckets: Dict[ItemType, Dict[int, Item]] = {item_type: {} for item_type in ItemType}
+        # consumable name -> its stack entry in the slots
+        self._stacks: Dict[str, Consumable] = {}
+        # item name -> number of slots holding it (zones locked behind a key item)
+        self._names: Dict[str, int] = {}
         self.equipped_weapon: Optional[Weapon] = None
         self.equipped_armor: Optional[Armor] = None
+        # Incremented on every equipment change to invalidate the owner's stat cache
+        self._equipment_version = 0
+    
+    @property
+    def items(self) -> List[Item]:
+        return list(self._slots.values())
+    
+    def __len__(self) -> int:
+        return len(self._slots)
+    
+    def __contains__(self, item: Item) -> bool:
+        return id(item) in self._slots
+    
+    def hasItemNamed(self, name: str) -> bool:
+        return name in self._names
     
     def isFull(self) -> bool:
-        return len(self.items) >= self.MAX_SLOTS
+        return len(self._slots) >= self.MAX_SLOTS
     
     def getAvailableSlots(self) -> int:
-        return self.MAX_SLOTS - len(self.items)
+        return self.MAX_SLOTS - len(self._slots)
     
     def addItem(self, item: Item) -> bool:
+        stack = self._findStack(item)
+        if stack is not None:
+            stack.quantity += item.quantity
+            write("{} added to inventory (x{})", item.name, stack.quantity)
+            return True
+        
         if self.isFull():
-            print(f"Inventory full ! {item.name} cannot be added.")
+            write("Inventory full ! {} cannot be added.", item.name)
             return False
         
-        self.items.append(item)
-        print(f"{item.name} added to inventory ({len(self.items)}/{self.MAX_SLOTS})")
+        self.restoreItem(item)
+        write("{} added to inventory ({}/{})", item.name, len(self._slots), self.MAX_SLOTS)
         return True
     
+    def restoreItem(self, item: Item) -> None:
+        """Stores an item without slot check nor message, used when loading a save."""
+        stack = self._findStack(item)
+        if stack is not None:
+            stack.quantity += item.quantity
+            return
+        
+        self._slots[id(item)] = item
+        self._buckets[item.item_type][id(item)] = item
+        self._names[item.name] = self._names.get(item.name, 0) + 1
+        if isinstance(item, Consumable) and not item.is_used:
+            self._stacks[item.name] = item
+    
+    def _findStack(self, item: Item) -> Optional[Consumable]:
+        if not isinstance(item, Consumable):
+            return None
+        
+        stack = self._stacks.get(item.name)
+        if stack is not None and stack is not item and stack.canStackWith(item):
+            return stack
+        return None
+    
     def removeItem(self, item: Item) -> bool:
-        if item in self.items:
-            self.items.remove(item)
-            print(f"{item.name} removed from inventory")
+        if self._slots.pop(id(item), None) is not None:
+            del self._buckets[item.item_type][id(item)]
+            if self._names[item.name] == 1:
+                del self._names[item.name]
+            else:
+                self._names[item.name] -= 1
+            if self._stacks.get(item.name) is item:
+                del self._stacks[item.name]
+            write("{} removed from inventory", item.name)
             return True
         return False
     
+    def consumeItem(self, consumable: Consumable) -> bool:
+        """Takes one consumable off its stack, freeing the slot with the last one."""
+        if consumable not in self:
+            return False
+        
+        if consumable.quantity > 1:
+            consumable.quantity -= 1
+            consumable.is_used = False
+            return True
+        return self.removeItem(consumable)
+    
     def equipWeapon(self, weapon: Weapon, character) -> bool:
-        if weapon not in self.items:
-            print(f"{weapon.name} is not in the inventory")
+        if weapon not in self:
+            write("{} is not in the inventory", weapon.name)
             return False
         
         if not weapon.canUse(character):
-            print(f"Level {weapon.minimal_level} required to equip {weapon.name}")
+            write("Level {} required to equip {}", weapon.minimal_level, weapon.name)
             return False
         
         # Unequip current weapon if any
         if self.equipped_weapon:
-            print(f"{self.equipped_weapon.name} unequipped")
+            write("{} unequipped", self.equipped_weapon.name)
         
         self.equipped_weapon = weapon
-        print(f"{weapon.name} equipped!")
+        self._equipment_version += 1
+        write("{} equipped!", weapon.name)
         return True
     
     def equipArmor(self, armor: Armor, character) -> bool:
-        if armor not in self.items:
-            print(f"{armor.name} is not in the inventory")
+        if armor not in self:
+            write("{} is not in the inventory", armor.name)
             return False
         
         if not armor.canUse(character):
-            print(f"Level {armor.minimal_level} required to equip {armor.name}")
+            write("Level {} required to equip {}", armor.minimal_level, armor.name)
             return False
         
         # Unequip current armor if any
         if self.equipped_armor:
-            print(f"{self.equipped_armor.name} unequipped")
+            write("{} unequipped", self.equipped_armor.name)
         
         self.equipped_armor = armor
-        print(f"{armor.name} equipped!")
+        self._equipment_version += 1
+        write("{} equipped!", armor.name)
         return True
     
     def unequipWeapon(self) -> bool:
         if not self.equipped_weapon:
-            print("No weapon equipped")
+            write("No weapon equipped")
             return False
         
-        print(f"{self.equipped_weapon.name} unequipped")
+        write("{} unequipped", self.equipped_weapon.name)
         self.equipped_weapon = None
+        self._equipment_version += 1
         return True
     
     def unequipArmor(self) -> bool:
         if not self.equipped_armor:
-            print("No armor equipped")
+            write("No armor equipped")
             return False
         
-        print(f"{self.equipped_armor.name} unequipped")
+        write("{} unequipped", self.equipped_armor.name)
         self.equipped_armor = None
+        self._equipment_version += 1
         return True
     
     def useConsumable(self, consumable: Consumable, character) -> bool:
-        if consumable not in self.items:
-            print(f"{consumable.name} is not in the inventory")
+        if consumable not in self:
+            write("{} is not in the inventory", consumable.name)
             return False
         
         # Use the consumable
         result = consumable.use(character)
         
-        # If used successfully, remove it from the inventory
+        # If used successfully, take it off its stack
         if result or consumable.is_used:
-            self.removeItem(consumable)
+            self.consumeItem(consumable)
         
         return result
     
     def getItemsByType(self, item_type: ItemType) -> List[Item]:
-        print(f"Getting items of type: {item_type}")
-        print(f"Current inventory items: {[item.name for item in self.items]}")
-        return [item for item in self.items if item.item_type == item_type]
+        return list(self._buckets[item_type].values())
+    
+    def countItems(self, item_type: ItemType) -> int:
+        return len(self._buckets[item_type])
     
     def getWeapons(self) -> List[Weapon]:
-        return [item for item in self.items if isinstance(item, Weapon)]
+        return self.getItemsByType(ItemType.WEAPON)
     
     def getArmors(self) -> List[Armor]:
-        return [item for item in self.items if isinstance(item, Armor)]
+        return self.getItemsByType(ItemType.ARMOR)
     
     def getConsumables(self) -> List[Consumable]:
-        return [item for item in self.items if isinstance(item, Consumable)]
+        return self.getItemsByType(ItemType.CONSUMABLE)
+    
+    def toDict(self) -> dict:
+        return {
+            "items": self.items,
+            "equipped_weapon": self.equipped_weapon,
+            "equipped_armor": self.equipped_armor
+        }
     
     def display(self):
-        print("\n" + "=" * 60)
-        print(f"INVENTORY ({len(self.items)}/{self.MAX_SLOTS} slots)")
-        print("=" * 60)
+        if not isEnabled():
+            return
+        
+        write("\n" + "=" * 60)
+        write("INVENTORY ({}/{} slots)", len(self._slots), self.MAX_SLOTS)
+        write("=" * 60)
         
         # Display equipment
-        print("\nCURRENT EQUIPMENT:")
-        print("-" * 60)
+        write("\nCURRENT EQUIPMENT:")
+        write("-" * 60)
         if self.equipped_weapon:
-            print(f"  Weapon    : {self.equipped_weapon.getDescription()}")
+            write("  Weapon    : {}", self.equipped_weapon.getDescription())
         else:
-            print(f"  Weapon    : None")
+            write("  Weapon    : None")
         
         if self.equipped_armor:
-            print(f"  Armor  : {self.equipped_armor.getDescription()}")
+            write("  Armor  : {}", self.equipped_armor.getDescription())
         else:
-            print(f"  Armor  : None")
+            write("  Armor  : None")
         
         # Display weapons
         weapons = self.getWeapons()
         if weapons:
-            print(f"\nWEAPONS ({len(weapons)}):")
-            print("-" * 60)
+            write("\nWEAPONS ({}):", len(weapons))
+            write("-" * 60)
             for i, weapon in enumerate(weapons, 1):
                 equipped = " [EQUIPPED]" if weapon == self.equipped_weapon else ""
-                print(f"  {i}. {weapon.getDescription()}{equipped}")
+                write("  {}. {}{}", i, weapon.getDescription(), equipped)
         
         # Display armors
         armors = self.getArmors()
         if armors:
-            print(f"\nARMORS ({len(armors)}):")
-            print("-" * 60)
+            write("\nARMORS ({}):", len(armors))
+            write("-" * 60)
             for i, armor in enumerate(armors, 1):
                 equipped = " [EQUIPPED]" if armor == self.equipped_armor else ""
-                print(f"  {i}. {armor.getDescription()}{equipped}")
+                write("  {}. {}{}", i, armor.getDescription(), equipped)
         
         # Display consumables
         consumables = self.getConsumables()
         if consumables:
-            print(f"\nCONSUMABLES ({len(consumables)}):")
-            print("-" * 60)
+            write("\nCONSUMABLES ({}):", len(consumables))
+            write("-" * 60)
             for i, consumable in enumerate(consumables, 1):
-                print(f"  {i}. {consumable.getDescription()}")
+                write("  {}. {}", i, consumable.getDescription())
         
-        if not self.items:
-            print("\n  [Inventory empty]")
+        if not self._slots:
+            write("\n  [Inventory empty]")
         
-        print("=" * 60 + "\n")
+        write("=" * 60 + "\n")
     
     def displayCompact(self):
-        weapons_count = len(self.getWeapons())
-        armors_count = len(self.getArmors())
-        consumables_count = len(self.getConsumables())
+        if not isEnabled():
+            return
+        
+        weapons_count = self.countItems(ItemType.WEAPON)
+        armors_count = self.countItems(ItemType.ARMOR)
+        consumables_count = self.countItems(ItemType.CONSUMABLE)
         
         equipped_info = ""
         if self.equipped_weapon or self.equipped_armor:
@@ -174,5 +260,4 @@ class Inventory:
                 equipped_parts.append(f"Armor: {self.equipped_armor.name}")
             equipped_info = f" | Equipped: {', '.join(equipped_parts)}"
         
-        print(f"Inventory: {len(self.items)}/{self.MAX_SLOTS} | "
-              f"Weapons:{weapons_count} Armors:{armors_count} Consumables:{consumables_count}{equipped_info}")
+        write("Inventory: {}/{} | Weapons:{} Armors:{} Consumables:{}{}", len(self._slots), self.MAX_SLOTS, weapons_count, armors_count, consumables_count, equipped_info)
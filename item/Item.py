@@ -1,6 +1,7 @@
 from enum import Enum
 from abc import ABC, abstractmethod
 from typing import TYPE_CHECKING
+from Renderer import write
 
 if TYPE_CHECKING:
     from entity.Character import Character
@@ -14,17 +15,91 @@ class ModifierType(Enum):
     ADD = "add"
     PERCENTAGE = "percentage"
 
+class ItemPrototype:
+    """Immutable definition of an item, shared by all of its instances (flyweight)."""
+    __slots__ = ('name', 'item_type', 'minimal_level', 'modifier_type', 'value', 'affected_stats', 'apparition_rate')
+
+    def __init__(self, name: str, item_type: ItemType, minimal_level: int, 
+                 modifier_type: ModifierType, value: int, affected_stats, 
+                 apparition_rate: int):
+        object.__setattr__(self, 'name', name)
+        object.__setattr__(self, 'item_type', item_type)
+        object.__setattr__(self, 'minimal_level', minimal_level)
+        object.__setattr__(self, 'modifier_type', modifier_type)
+        object.__setattr__(self, 'value', value)
+        object.__setattr__(self, 'affected_stats', tuple(affected_stats))
+        object.__setattr__(self, 'apparition_rate', apparition_rate)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"ItemPrototype is immutable, cannot set '{name}'")
+
+    def __repr__(self):
+        return f"ItemPrototype({self.name!r}, {self.item_type.value})"
+
+
 class Item:
+    # Tout l'etat immuable est dans le prototype partage
+    __slots__ = ('_prototype',)
+
     def __init__(self, name: str, item_type: ItemType, minimal_level: int, 
                  modifier_type: ModifierType, value: int, affected_stats: list, 
                  apparition_rate: int):
-        self.name = name
-        self.item_type = item_type
-        self.minimal_level = minimal_level
-        self.modifier_type = modifier_type
-        self.value = value
-        self.affected_stats = affected_stats
-        self.apparition_rate = apparition_rate
+        self._prototype = ItemPrototype(name, item_type, minimal_level, modifier_type, 
+                                        value, affected_stats, apparition_rate)
+
+    @classmethod
+    def fromPrototype(cls, prototype: ItemPrototype) -> "Item":
+        """Creates an instance sharing the given prototype, only the mutable state is new."""
+        item = cls.__new__(cls)
+        item._prototype = prototype
+        item.resetState()
+        return item
+
+    def resetState(self) -> None:
+        pass
+
+    @property
+    def prototype(self) -> ItemPrototype:
+        return self._prototype
+
+    @property
+    def name(self) -> str:
+        return self._prototype.name
+
+    @property
+    def item_type(self) -> ItemType:
+        return self._prototype.item_type
+
+    @property
+    def minimal_level(self) -> int:
+        return self._prototype.minimal_level
+
+    @property
+    def modifier_type(self) -> ModifierType:
+        return self._prototype.modifier_type
+
+    @property
+    def value(self) -> int:
+        return self._prototype.value
+
+    @property
+    def affected_stats(self) -> tuple:
+        return self._prototype.affected_stats
+
+    @property
+    def apparition_rate(self) -> int:
+        return self._prototype.apparition_rate
+
+    def toDict(self) -> dict:
+        return {
+            "name": self.name,
+            "item_type": self.item_type,
+            "minimal_level": self.minimal_level,
+            "modifier_type": self.modifier_type,
+            "value": self.value,
+            "affected_stats": list(self.affected_stats),
+            "apparition_rate": self.apparition_rate
+        }
 
     def canUse(self, character: "Character") -> bool:
         return character.level >= self.minimal_level
@@ -37,6 +112,8 @@ class Item:
 
 
 class Weapon(Item):
+    __slots__ = ()
+
     def __init__(self, name: str, minimal_level: int, modifier_type: ModifierType, 
                  value: int, affected_stats: list, apparition_rate: int):
         super().__init__(name, ItemType.WEAPON, minimal_level, modifier_type, 
@@ -48,6 +125,8 @@ class Weapon(Item):
 
 
 class Armor(Item):
+    __slots__ = ()
+
     def __init__(self, name: str, minimal_level: int, modifier_type: ModifierType, 
                  value: int, affected_stats: list, apparition_rate: int):
         super().__init__(name, ItemType.ARMOR, minimal_level, modifier_type, 
@@ -59,30 +138,51 @@ class Armor(Item):
 
 
 class Consumable(Item):
+    __slots__ = ('is_used', 'quantity')
+
     def __init__(self, name: str, minimal_level: int, modifier_type: ModifierType, 
                  value: int, affected_stats: list, apparition_rate: int):
         super().__init__(name, ItemType.CONSUMABLE, minimal_level, modifier_type, 
                         value, affected_stats, apparition_rate)
+        self.resetState()
+
+    def resetState(self) -> None:
         self.is_used = False
+        # Identical unused consumables share one inventory slot
+        self.quantity = 1
+
+    def canStackWith(self, other: "Item") -> bool:
+        return (isinstance(other, Consumable) and other.name == self.name
+                and not self.is_used and not other.is_used)
+
+    def toDict(self) -> dict:
+        data = super().toDict()
+        data["is_used"] = self.is_used
+        data["quantity"] = self.quantity
+        return data
 
     def getDescription(self) -> str:
         if "hp" in self.affected_stats:
-            return f"Consumable: {self.name} - Restores {self.value} HP"
+            description = f"Consumable: {self.name} - Restores {self.value} HP"
         elif "damage" in self.affected_stats:
-            return f"Consumable: {self.name} - Deals {self.value} area damage"
+            description = f"Consumable: {self.name} - Deals {self.value} area damage"
         elif "status" in self.affected_stats:
-            return f"Consumable: {self.name} - Removes status effects"
+            description = f"Consumable: {self.name} - Removes status effects"
         else:
             modifier = f"+{self.value}%" if self.modifier_type == ModifierType.PERCENTAGE else f"+{self.value}"
             stats_desc = ", ".join([f"{modifier} {stat}" for stat in self.affected_stats])
-            return f"{self.name} - {stats_desc}"
+            description = f"{self.name} - {stats_desc}"
+        
+        if self.quantity > 1:
+            description += f" (x{self.quantity})"
+        return description
 
     def use(self, character: "Character"):
         if self.is_used:
             return False
         
         if not self.canUse(character):
-            print(f"Level {self.minimal_level} required to use {self.name}")
+            write("Level {} required to use {}", self.minimal_level, self.name)
             return False
 
         # Apply effects based on the type of consumable
@@ -90,18 +190,18 @@ class Consumable(Item):
             old_hp = character.hp
             character.hp = min(character.hp + self.value, character.hpMax)
             healed = character.hp - old_hp
-            print(f"{character.name} uses {self.name} and restores {healed} HP! (HP: {character.hp}/{character.hpMax})")
+            write("{} uses {} and restores {} HP! (HP: {}/{})", character.name, self.name, healed, character.hp, character.hpMax)
         
         elif "damage" in self.affected_stats:
-            print(f"{character.name} uses {self.name}! Deals {self.value} area damage!")
+            write("{} uses {}! Deals {} area damage!", character.name, self.name, self.value)
             return self.value  # Returns the damage to be used in combat
         
         elif "status" in self.affected_stats:
-            print(f"{character.name} uses {self.name}! Removes status effects.")
+            write("{} uses {}! Removes status effects.", character.name, self.name)
         
         else:
             # For temporary buffs (strength potions, etc.)
-            print(f"{character.name} uses {self.name}! Stats temporarily increased.")
+            write("{} uses {}! Stats temporarily increased.", character.name, self.name)
         
         self.is_used = True
         return True
@@ -2,11 +2,23 @@ import json
 import random
 import os
 from typing import Optional, List
-from item.Item import Item, Weapon, Armor, Consumable, ItemType, ModifierType
+from item.Item import Item, ItemPrototype, Weapon, Armor, Consumable, ItemType, ModifierType
+from item.LootSampler import LootSampler
+from Renderer import write, isEnabled
+
+# item_type -> (items.json category, item class)
+ITEM_CATEGORIES = {
+    "weapon": ("weapons", Weapon),
+    "armor": ("armors", Armor),
+    "consumable": ("consumables", Consumable)
+}
 
 class ItemFactory:    
     def __init__(self, items_file: str = "items.json"):
         self.items_data = {}
+        self.prototypes = {}
+        self.samplers = {}
+        self.loaded_mtime = None
         self.items_file = items_file
         self.loadItems()
     
@@ -17,155 +29,178 @@ class ItemFactory:
                 script_dir = os.path.dirname(os.path.abspath(__file__))
                 self.items_file = os.path.join(script_dir, self.items_file)
             
+            self.loaded_mtime = os.path.getmtime(self.items_file)
             with open(self.items_file, 'r', encoding='utf-8') as f:
                 self.items_data = json.load(f)
-            print(f"Items loaded from {self.items_file}")
+            write("Items loaded from {}", self.items_file)
         except FileNotFoundError:
-            print(f"File {self.items_file} not found. Using default data.")
+            write("File {} not found. Using default data.", self.items_file)
             self.items_data = {"weapons": [], "armors": [], "consumables": []}
         except json.JSONDecodeError as e:
-            print(f"JSON parsing error: {e}")
+            write("JSON parsing error: {}", e)
             self.items_data = {"weapons": [], "armors": [], "consumables": []}
+        
+        self.buildIndex()
     
-    def createItemFromData(self, item_data: dict, item_type: str) -> Optional[Item]:
+    def reloadIfModified(self) -> bool:
+        """Reloads the catalog when the items file changed on disk since it was loaded."""
         try:
-            name = item_data["name"]
-            minimal_level = item_data["minimalLevel"]
-            modifier_type = ModifierType(item_data["modifierType"])
-            value = item_data["value"]
-            affected_stats = item_data["affectedStats"]
-            apparition_rate = item_data["apparitionRate"]
-            
-            if item_type == "weapon":
-                return Weapon(name, minimal_level, modifier_type, value, affected_stats, apparition_rate)
-            elif item_type == "armor":
-                return Armor(name, minimal_level, modifier_type, value, affected_stats, apparition_rate)
-            elif item_type == "consumable":
-                return Consumable(name, minimal_level, modifier_type, value, affected_stats, apparition_rate)
-            
+            mtime = os.path.getmtime(self.items_file)
+        except OSError:
+            return False
+        
+        if mtime == self.loaded_mtime:
+            return False
+        
+        self.loadItems()
+        return True
+    
+    def buildIndex(self):
+        """Parses the raw catalog once into name -> shared prototype indexes, per item type."""
+        self.prototypes = {item_type: {} for item_type in ITEM_CATEGORIES}
+        for item_type, (category, _) in ITEM_CATEGORIES.items():
+            for item_data in self.items_data.get(category, []):
+                prototype = self.createPrototype(item_data, item_type)
+                if prototype:
+                    self.prototypes[item_type][prototype.name] = prototype
+        
+        self.samplers = {item_type: LootSampler(prototypes.values()) for item_type, prototypes in self.prototypes.items()}
+    
+    def createPrototype(self, item_data: dict, item_type: str) -> Optional[ItemPrototype]:
+        try:
+            return ItemPrototype(
+                name=item_data["name"],
+                item_type=ItemType(item_type),
+                minimal_level=item_data["minimalLevel"],
+                modifier_type=ModifierType(item_data["modifierType"]),
+                value=item_data["value"],
+                affected_stats=item_data["affectedStats"],
+                apparition_rate=item_data["apparitionRate"]
+            )
         except KeyError as e:
-            print(f"Missing data for item: {e}")
+            write("Missing data for item: {}", e)
             return None
         except ValueError as e:
-            print(f"Invalid value for item: {e}")
+            write("Invalid value for item: {}", e)
+            return None
+    
+    def createItemFromData(self, item_data: dict, item_type: str) -> Optional[Item]:
+        prototype = self.createPrototype(item_data, item_type)
+        if prototype is None:
             return None
+        return ITEM_CATEGORIES[item_type][1].fromPrototype(prototype)
+    
+    def createItem(self, name: str, item_type: str) -> Optional[Item]:
+        prototype = self.prototypes[item_type].get(name)
+        if prototype is None:
+            return None
+        return ITEM_CATEGORIES[item_type][1].fromPrototype(prototype)
     
     def createWeapon(self, name: str) -> Optional[Weapon]:
-        for weapon_data in self.items_data.get("weapons", []):
-            if weapon_data["name"] == name:
-                return self.createItemFromData(weapon_data, "weapon")
-        print(f"Warning: Weapon '{name}' not found")
-        return None
+        weapon = self.createItem(name, "weapon")
+        if weapon is None:
+            write("Warning: Weapon '{}' not found", name)
+        return weapon
     
     def createArmor(self, name: str) -> Optional[Armor]:
-        for armor_data in self.items_data.get("armors", []):
-            if armor_data["name"] == name:
-                return self.createItemFromData(armor_data, "armor")
-        print(f"Warning: Armor '{name}' not found")
-        return None
+        armor = self.createItem(name, "armor")
+        if armor is None:
+            write("Warning: Armor '{}' not found", name)
+        return armor
     
     def createConsumable(self, name: str) -> Optional[Consumable]:
-        for consumable_data in self.items_data.get("consumables", []):
-            if consumable_data["name"] == name:
-                return self.createItemFromData(consumable_data, "consumable")
-        print(f"Warning: Consumable '{name}' not found")
-        return None
-    
-    def getRandomWeapon(self, max_level: int = 100) -> Optional[Weapon]:
-        available_weapons = [
-            w for w in self.items_data.get("weapons", [])
-            if w["minimalLevel"] <= max_level
-        ]
-        
-        if not available_weapons:
-            return None
-
-        weights = [w["apparitionRate"] for w in available_weapons]
-        chosen_data = random.choices(available_weapons, weights=weights, k=1)[0]
-        return self.createItemFromData(chosen_data, "weapon")
-    
-    def getRandomArmor(self, max_level: int = 100) -> Optional[Armor]:
-        available_armors = [
-            a for a in self.items_data.get("armors", [])
-            if a["minimalLevel"] <= max_level
-        ]
-        
-        if not available_armors:
-            return None
-        
-        weights = [a["apparitionRate"] for a in available_armors]
-        chosen_data = random.choices(available_armors, weights=weights, k=1)[0]
-        return self.createItemFromData(chosen_data, "armor")
-    
-    def getRandomConsumable(self, max_level: int = 100) -> Optional[Consumable]:
-        available_consumables = [
-            c for c in self.items_data.get("consumables", [])
-            if c["minimalLevel"] <= max_level
-        ]
-        
-        if not available_consumables:
-            return None
-        
-        weights = [c["apparitionRate"] for c in available_consumables]
-        chosen_data = random.choices(available_consumables, weights=weights, k=1)[0]
-        return self.createItemFromData(chosen_data, "consumable")
+        consumable = self.createItem(name, "consumable")
+        if consumable is None:
+            write("Warning: Consumable '{}' not found", name)
+        return consumable
+    
+    def getRandomPrototype(self, item_type: str, max_level: int, rng: random.Random = random) -> Optional[ItemPrototype]:
+        return self.samplers[item_type].sample(max_level, rng)
+    
+    def getRandomWeapon(self, max_level: int = 100, rng: random.Random = random) -> Optional[Weapon]:
+        prototype = self.getRandomPrototype("weapon", max_level, rng)
+        return Weapon.fromPrototype(prototype) if prototype else None
+    
+    def getRandomArmor(self, max_level: int = 100, rng: random.Random = random) -> Optional[Armor]:
+        prototype = self.getRandomPrototype("armor", max_level, rng)
+        return Armor.fromPrototype(prototype) if prototype else None
     
-    def getRandomItem(self, max_level: int = 100) -> Optional[Item]:
+    def getRandomConsumable(self, max_level: int = 100, rng: random.Random = random) -> Optional[Consumable]:
+        prototype = self.getRandomPrototype("consumable", max_level, rng)
+        return Consumable.fromPrototype(prototype) if prototype else None
+    
+    def getRandomItem(self, max_level: int = 100, rng: random.Random = random) -> Optional[Item]:
         item_types = ["weapon", "armor", "consumable"]
-        chosen_type = random.choice(item_types)
+        chosen_type = rng.choice(item_types)
         
         if chosen_type == "weapon":
-            return self.getRandomWeapon(max_level)
+            return self.getRandomWeapon(max_level, rng)
         elif chosen_type == "armor":
-            return self.getRandomArmor(max_level)
+            return self.getRandomArmor(max_level, rng)
         else:
-            return self.getRandomConsumable(max_level)
+            return self.getRandomConsumable(max_level, rng)
+    
+    def rollItems(self, k: int, max_level: int = 100, item_type: Optional[str] = None,
+                  rng: random.Random = random) -> List[Item]:
+        """Rolls k items at once, e.g. for chests dropping several items.
+
+        Without item_type, each item picks its type uniformly like getRandomItem.
+        """
+        if item_type is not None:
+            item_class = ITEM_CATEGORIES[item_type][1]
+            return [item_class.fromPrototype(p) for p in self.samplers[item_type].roll(k, max_level, rng)]
+        
+        items = []
+        for chosen_type in rng.choices(list(ITEM_CATEGORIES), k=k):
+            prototype = self.samplers[chosen_type].sample(max_level, rng)
+            if prototype:
+                items.append(ITEM_CATEGORIES[chosen_type][1].fromPrototype(prototype))
+        return items
     
     def getAllWeapons(self) -> List[Weapon]:
-        weapons = []
-        for weapon_data in self.items_data.get("weapons", []):
-            weapon = self.createItemFromData(weapon_data, "weapon")
-            if weapon:
-                weapons.append(weapon)
-        return weapons
+        return [Weapon.fromPrototype(p) for p in self.prototypes["weapon"].values()]
     
     def getAllArmors(self) -> List[Armor]:
-        armors = []
-        for armor_data in self.items_data.get("armors", []):
-            armor = self.createItemFromData(armor_data, "armor")
-            if armor:
-                armors.append(armor)
-        return armors
+        return [Armor.fromPrototype(p) for p in self.prototypes["armor"].values()]
     
     def getAllConsumables(self) -> List[Consumable]:
-        consumables = []
-        for consumable_data in self.items_data.get("consumables", []):
-            consumable = self.createItemFromData(consumable_data, "consumable")
-            if consumable:
-                consumables.append(consumable)
-        return consumables
+        return [Consumable.fromPrototype(p) for p in self.prototypes["consumable"].values()]
     
     def display_catalog(self):
-        print("\n" + "=" * 70)
-        print("ITEMS CATALOG")
-        print("=" * 70)
+        if not isEnabled():
+            return
+        
+        write("\n" + "=" * 70)
+        write("ITEMS CATALOG")
+        write("=" * 70)
         
-        print("\nWEAPONS:")
-        print("-" * 70)
+        write("\nWEAPONS:")
+        write("-" * 70)
         weapons = self.getAllWeapons()
         for weapon in weapons:
-            print(f"  {weapon.getDescription()} - Lvl {weapon.minimal_level} - Rarity: {weapon.apparition_rate}")
+            write("  {} - Lvl {} - Rarity: {}", weapon.getDescription(), weapon.minimal_level, weapon.apparition_rate)
         
-        print("\nARMORS:")
-        print("-" * 70)
+        write("\nARMORS:")
+        write("-" * 70)
         armors = self.getAllArmors()
         for armor in armors:
-            print(f"  {armor.getDescription()} - Lvl {armor.minimal_level} - Rarity: {armor.apparition_rate}")
+            write("  {} - Lvl {} - Rarity: {}", armor.getDescription(), armor.minimal_level, armor.apparition_rate)
         
-        print("\nCONSUMABLES:")
-        print("-" * 70)
+        write("\nCONSUMABLES:")
+        write("-" * 70)
         consumables = self.getAllConsumables()
         for consumable in consumables:
-            print(f"  {consumable.getDescription()} - Lvl {consumable.minimal_level} - Rarity: {consumable.apparition_rate}")
+            write("  {} - Lvl {} - Rarity: {}", consumable.getDescription(), consumable.minimal_level, consumable.apparition_rate)
         
-        print("=" * 70 + "\n")
+        write("=" * 70 + "\n")
+
+
+_shared_factory: Optional[ItemFactory] = None
+
+
+def getItemFactory() -> ItemFactory:
+    """Returns the process-wide catalog, reading items.json on first use only."""
+    global _shared_factory
+    if _shared_factory is None:
+        _shared_factory = ItemFactory()
+    return _shared_factory
@@ -0,0 +1,41 @@
+import random
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Iterable, List, Optional
+from item.Item import ItemPrototype
+
+class LootSampler:
+    """Weighted loot rolls over the prototypes whose minimal level is <= max_level.
+
+    Prototypes are sorted by minimal level once, with running cumulative
+    weights, so every level bucket is a prefix of the same arrays: one bisect
+    finds the bucket and a second one picks the item. A roll costs O(log n)
+    whatever the catalog size, with the same odds as random.choices over the
+    filtered list.
+    """
+    def __init__(self, prototypes: Iterable[ItemPrototype]):
+        # Les objets de poids nul ne peuvent jamais sortir, inutile de les garder
+        self.prototypes = sorted((p for p in prototypes if p.apparition_rate > 0), key=lambda p: p.minimal_level)
+        self.levels = [p.minimal_level for p in self.prototypes]
+        self.cum_weights = list(accumulate(p.apparition_rate for p in self.prototypes))
+
+    def bucketSize(self, max_level: int) -> int:
+        return bisect_right(self.levels, max_level)
+
+    def sample(self, max_level: int, rng: random.Random = random) -> Optional[ItemPrototype]:
+        end = self.bucketSize(max_level)
+        if not end:
+            return None
+
+        total = self.cum_weights[end - 1]
+        return self.prototypes[bisect_right(self.cum_weights, rng.random() * total, 0, end - 1)]
+
+    def roll(self, k: int, max_level: int, rng: random.Random = random) -> List[ItemPrototype]:
+        end = self.bucketSize(max_level)
+        if not end:
+            return []
+
+        cum_weights = self.cum_weights
+        total = cum_weights[end - 1]
+        hi = end - 1
+        return [self.prototypes[bisect_right(cum_weights, rng.random() * total, 0, hi)] for _ in range(k)]
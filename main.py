@@ -1,15 +1,21 @@
 from entity.Character import *
 from entity.EnemyFactory import *
+import argparse
 from Game import Game
-from zone.ZoneState import ForestState, VillageState
+from GameEngine import createEngine
 from Utils import inputMenu
-from item.ItemFactory import ItemFactory
+from item.ItemFactory import getItemFactory
 from SaveGame import SaveGame
+from save.SaveWriter import SaveWriter
+from SessionRecorder import SessionRecorder
+from RngStream import RngStream
+from Renderer import write, flush
 
-def buildGame(character=None) -> Game:
+def buildGame(character=None, seed: int = None, record_path: str = None) -> Game:
     if character:
         player = character
     else:
+        flush()
         playerName = input("Enter your character's name: ")
 
         player_class_choice = inputMenu("Choose your class", ["Warrior", "Mage", "Rogue"])
@@ -22,41 +28,39 @@ def buildGame(character=None) -> Game:
         else:
             player = Warrior(playerName)  # Default to Warrior if invalid choice
 
-    enemy_factory = EnemyFactory()
-    item_factory = ItemFactory()
+    # Toute la partie tire dans ce flux, sa graine est enregistree dans les sauvegardes
+    rng = RngStream(seed)
+    item_factory = getItemFactory()
+    item_factory.reloadIfModified()
     
-    # Ajoute quelques potions
-    for _ in range(2):
-        potion = item_factory.createConsumable("Potion de soin")
-        if potion:
-            player.inventory.addItem(potion)
+    # Le personnage est enregistre avant ses objets de depart, que le replay redonne
+    recorder = SessionRecorder(record_path, player, rng.initial_seed) if record_path else None
+    engine = createEngine(player, rng, EnemyFactory(), item_factory, SaveWriter())
     
-    print(f"\nStarting stats:")
+    write("\nStarting stats:")
     player.displayStats()
 
-    village = VillageState()
-    forest = ForestState(enemy_factory)
-
-    village.connect("forest", forest)
-    forest.connect("village", village)
-
-    game = Game(character=player, enemy_factory=enemy_factory, starting_location=village)
+    game = Game(engine, recorder)
     return game
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Aetherfall")
+    parser.add_argument("--seed", type=int, default=None, help="seed of the session (default: random)")
+    parser.add_argument("--record", metavar="PATH", default=None, help="record the session for Replay.py")
+    args = parser.parse_args()
+
     while True:
         choice = inputMenu("Main Menu", ["Nouvelle partie", "Charger partie", "Quitter"])
 
         if choice == 1:
-            random.seed()
-            game = buildGame()
+            game = buildGame(seed=args.seed, record_path=args.record)
             game.run()
         elif choice == 2:
             save_manager = SaveGame()
             character = save_manager.load()
             if character:
-                game = buildGame(character)
+                game = buildGame(character, args.seed, args.record)
                 game.run()
         elif choice == 3:
             exit(0)
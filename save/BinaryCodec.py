@@ -0,0 +1,285 @@
+import struct
+import zlib
+from typing import Optional
+from entity.Character import Character, Warrior, Mage, Thief
+from inventory.Inventory import Inventory
+from item.Item import Item, ItemPrototype, ItemType, ModifierType, Weapon, Armor, Consumable
+from item.ItemFactory import ItemFactory, getItemFactory
+
+MAGIC = b"AETF"
+VERSION = 2
+BINARY_EXT = '.sav'
+
+FLAG_COMPRESSED = 0x01
+
+HEADER = struct.Struct('<4sBB')
+U8 = struct.Struct('<B')
+U16 = struct.Struct('<H')
+I16 = struct.Struct('<h')
+# level, xp, hp, hpMax, strength, defense, intelligence, agility, critChance
+STATS = struct.Struct('<iidiiiiii')
+# minimal_level, modifier, value, apparition_rate
+DEFINITION = struct.Struct('<iBii')
+CONSUMABLE_STATE = struct.Struct('<BH')
+# Graine de la partie (version 2), NO_SEED si inconnue
+SEED = struct.Struct('<q')
+NO_SEED = -1
+
+ITEM_KINDS = (ItemType.WEAPON, ItemType.ARMOR, ItemType.CONSUMABLE)
+ITEM_CLASSES = {ItemType.WEAPON: Weapon, ItemType.ARMOR: Armor, ItemType.CONSUMABLE: Consumable}
+MODIFIERS = (ModifierType.ADD, ModifierType.PERCENTAGE)
+CLASS_MAP = {"Warrior": Warrior, "Mage": Mage, "Thief": Thief}
+
+# Octet de poids fort du type d'objet : la definition complete suit au lieu d'une reference au catalogue
+INLINE = 0x80
+NO_ITEM = -1
+INLINE_ITEM = -2
+
+
+class SaveFormatError(ValueError):
+    pass
+
+
+class _Writer:
+    def __init__(self):
+        self.parts = []
+
+    def pack(self, fmt: struct.Struct, *values) -> None:
+        self.parts.append(fmt.pack(*values))
+
+    def string(self, value: str) -> None:
+        data = value.encode('utf-8')
+        self.parts.append(U16.pack(len(data)))
+        self.parts.append(data)
+
+    def getvalue(self) -> bytes:
+        return b"".join(self.parts)
+
+
+class _Reader:
+    def __init__(self, data: bytes):
+        self.data = data
+        self.offset = 0
+
+    def unpack(self, fmt: struct.Struct) -> tuple:
+        values = fmt.unpack_from(self.data, self.offset)
+        self.offset += fmt.size
+        return values
+
+    def string(self) -> str:
+        (length,) = U16.unpack_from(self.data, self.offset)
+        start = self.offset + U16.size
+        self.offset = start + length
+        return self.data[start:self.offset].decode('utf-8')
+
+
+def _is_catalog_item(item: Item, catalog: ItemFactory) -> bool:
+    prototype = catalog.prototypes.get(item.item_type.value, {}).get(item.name)
+    if prototype is None:
+        return False
+    if prototype is item.prototype:
+        return True
+    return all(getattr(prototype, field) == getattr(item.prototype, field) for field in ItemPrototype.__slots__)
+
+
+def _write_item(writer: _Writer, item: Item, catalog: ItemFactory) -> None:
+    kind = ITEM_KINDS.index(item.item_type)
+    inline = not _is_catalog_item(item, catalog)
+    writer.pack(U8, kind | (INLINE if inline else 0))
+    writer.string(item.name)
+
+    if inline:
+        writer.pack(DEFINITION, item.minimal_level, MODIFIERS.index(item.modifier_type), item.value, item.apparition_rate)
+        writer.pack(U8, len(item.affected_stats))
+        for stat in item.affected_stats:
+            writer.string(stat)
+
+    if isinstance(item, Consumable):
+        writer.pack(CONSUMABLE_STATE, item.is_used, item.quantity)
+
+
+def _is_catalog_state(data: dict, catalog: ItemFactory) -> bool:
+    prototype = catalog.prototypes.get(data["item_type"], {}).get(data["name"])
+    return (prototype is not None
+            and prototype.minimal_level == data["minimal_level"]
+            and prototype.modifier_type.value == data["modifier_type"]
+            and prototype.value == data["value"]
+            and list(prototype.affected_stats) == list(data["affected_stats"])
+            and prototype.apparition_rate == data["apparition_rate"])
+
+
+def _write_item_state(writer: _Writer, data: dict, catalog: ItemFactory) -> None:
+    """Same encoding as _write_item, from the plain data of an item (see SaveGame.toPlainData)."""
+    item_type = ItemType(data["item_type"])
+    inline = not _is_catalog_state(data, catalog)
+    writer.pack(U8, ITEM_KINDS.index(item_type) | (INLINE if inline else 0))
+    writer.string(data["name"])
+
+    if inline:
+        writer.pack(DEFINITION, data["minimal_level"], MODIFIERS.index(ModifierType(data["modifier_type"])),
+                    data["value"], data["apparition_rate"])
+        writer.pack(U8, len(data["affected_stats"]))
+        for stat in data["affected_stats"]:
+            writer.string(stat)
+
+    if item_type == ItemType.CONSUMABLE:
+        writer.pack(CONSUMABLE_STATE, data.get("is_used", False), data.get("quantity", 1))
+
+
+def _read_item(reader: _Reader, catalog: ItemFactory) -> Item:
+    (kind,) = reader.unpack(U8)
+    item_type = ITEM_KINDS[kind & ~INLINE]
+    name = reader.string()
+
+    if kind & INLINE:
+        minimal_level, modifier, value, apparition_rate = reader.unpack(DEFINITION)
+        (stat_count,) = reader.unpack(U8)
+        affected_stats = [reader.string() for _ in range(stat_count)]
+        prototype = ItemPrototype(name, item_type, minimal_level, MODIFIERS[modifier], value, affected_stats, apparition_rate)
+    else:
+        prototype = catalog.prototypes.get(item_type.value, {}).get(name)
+        if prototype is None:
+            raise SaveFormatError(f"Item '{name}' is not in the catalog")
+
+    item = ITEM_CLASSES[item_type].fromPrototype(prototype)
+    if isinstance(item, Consumable):
+        is_used, item.quantity = reader.unpack(CONSUMABLE_STATE)
+        item.is_used = bool(is_used)
+    return item
+
+
+def _write_equipped(writer: _Writer, item: Optional[Item], slots: dict, catalog: ItemFactory) -> None:
+    if item is None:
+        writer.pack(I16, NO_ITEM)
+    elif id(item) in slots:
+        writer.pack(I16, slots[id(item)])
+    else:
+        writer.pack(I16, INLINE_ITEM)
+        _write_item(writer, item, catalog)
+
+
+def _write_equipped_state(writer: _Writer, data: Optional[dict], items: list, catalog: ItemFactory) -> None:
+    if not data:
+        writer.pack(I16, NO_ITEM)
+        return
+    # Les objets equipes sont ceux de l'inventaire : on retrouve leur emplacement par egalite
+    for slot, item in enumerate(items):
+        if item == data:
+            writer.pack(I16, slot)
+            return
+    writer.pack(I16, INLINE_ITEM)
+    _write_item_state(writer, data, catalog)
+
+
+def _read_equipped(reader: _Reader, items: list, catalog: ItemFactory) -> Optional[Item]:
+    (slot,) = reader.unpack(I16)
+    if slot == NO_ITEM:
+        return None
+    if slot == INLINE_ITEM:
+        return _read_item(reader, catalog)
+    return items[slot]
+
+
+def encodeCharacter(character: Character, compress: bool = False, catalog: ItemFactory = None) -> bytes:
+    """Packs a character into the compact binary save format.
+
+    Items found unchanged in the catalog are stored as a reference (type and
+    name) plus their mutable state; anything else is stored inline.
+    """
+    catalog = catalog or getItemFactory()
+    writer = _Writer()
+    writer.string(character.name)
+    writer.string(character.type)
+    writer.pack(STATS, character.level, character.xp, character.hp, character.hpMax, character.strength,
+                character.defense, character.intelligence, character.agility, character.critChance)
+    writer.pack(SEED, NO_SEED if character.seed is None else character.seed)
+
+    items = character.inventory.items
+    writer.pack(U16, len(items))
+    for item in items:
+        _write_item(writer, item, catalog)
+
+    slots = {id(item): slot for slot, item in enumerate(items)}
+    _write_equipped(writer, character.inventory.equipped_weapon, slots, catalog)
+    _write_equipped(writer, character.inventory.equipped_armor, slots, catalog)
+
+    return _finish(writer, compress)
+
+
+def encodeState(state: dict, compress: bool = False, catalog: ItemFactory = None) -> bytes:
+    """Same as encodeCharacter, straight from the plain data of a character (see SaveGame.toPlainData).
+
+    Lets the save worker encode a snapshot without rebuilding the Character.
+    """
+    catalog = catalog or getItemFactory()
+    writer = _Writer()
+    writer.string(state["name"])
+    writer.string(state["type"])
+    writer.pack(STATS, state["level"], state["xp"], state["hp"], state["hpMax"], state["strength"],
+                state["defense"], state["intelligence"], state["agility"], state["critChance"])
+    seed = state.get("seed")
+    writer.pack(SEED, NO_SEED if seed is None else seed)
+
+    inventory = state.get("inventory") or {}
+    items = inventory.get("items", [])
+    writer.pack(U16, len(items))
+    for item in items:
+        _write_item_state(writer, item, catalog)
+
+    _write_equipped_state(writer, inventory.get("equipped_weapon"), items, catalog)
+    _write_equipped_state(writer, inventory.get("equipped_armor"), items, catalog)
+    return _finish(writer, compress)
+
+
+def _finish(writer: _Writer, compress: bool) -> bytes:
+    body = writer.getvalue()
+    flags = 0
+    if compress:
+        body = zlib.compress(body, 6)
+        flags |= FLAG_COMPRESSED
+    return HEADER.pack(MAGIC, VERSION, flags) + body
+
+
+def decodeCharacter(data: bytes, catalog: ItemFactory = None) -> Character:
+    catalog = catalog or getItemFactory()
+    try:
+        magic, version, flags = HEADER.unpack_from(data, 0)
+    except struct.error as e:
+        raise SaveFormatError(f"Truncated save header: {e}")
+
+    if magic != MAGIC:
+        raise SaveFormatError("Not an Aetherfall binary save")
+    if version > VERSION:
+        raise SaveFormatError(f"Save format version {version} is newer than supported version {VERSION}")
+
+    try:
+        body = data[HEADER.size:]
+        if flags & FLAG_COMPRESSED:
+            body = zlib.decompress(body)
+
+        reader = _Reader(body)
+        name = reader.string()
+        char_type = reader.string()
+        cls = CLASS_MAP.get(char_type)
+        character = cls(name) if cls else Character(name=name, type=char_type)
+
+        (character.level, character.xp, character.hp, character.hpMax, character.strength, character.defense,
+         character.intelligence, character.agility, character.critChance) = reader.unpack(STATS)
+        if character.hp == int(character.hp):
+            character.hp = int(character.hp)
+        if version >= 2:
+            (seed,) = reader.unpack(SEED)
+            character.seed = None if seed == NO_SEED else seed
+
+        inventory = Inventory()
+        (item_count,) = reader.unpack(U16)
+        items = [_read_item(reader, catalog) for _ in range(item_count)]
+        for item in items:
+            inventory.restoreItem(item)
+        inventory.equipped_weapon = _read_equipped(reader, items, catalog)
+        inventory.equipped_armor = _read_equipped(reader, items, catalog)
+    except (struct.error, IndexError, UnicodeDecodeError, zlib.error) as e:
+        raise SaveFormatError(f"Corrupted save body: {e}")
+
+    character.inventory = inventory
+    return character
@@ -0,0 +1,152 @@
+import argparse
+import copy
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Iterator, List, Optional, Tuple
+from save.BinaryCodec import FLAG_COMPRESSED, HEADER, SaveFormatError, decodeCharacter, encodeCharacter
+from SaveGame import (SAVES_DIR, SAVE_EXTENSIONS, MANIFEST_FILE, JOURNAL_EXT, BINARY_EXT, toPlainData, readJournal,
+                      SAVE_SCHEMA_VERSION, writeFileAtomic, _deserialize_character)
+from Renderer import write, flush
+
+# Nombre de lots en attente par worker, borne la memoire quel que soit le nombre de fichiers
+BATCHES_IN_FLIGHT = 4
+MAX_REPORTED_FAILURES = 20
+
+
+def iterSaveFiles(directory: str) -> Iterator[str]:
+    """Streams the save files of a directory without listing it all in memory."""
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_file() and entry.name.endswith(SAVE_EXTENSIONS) and entry.name != MANIFEST_FILE:
+                yield entry.path
+
+
+def _migrate_text(filepath: str) -> Optional[bytes]:
+    deltas = 0
+    if filepath.endswith(JOURNAL_EXT):
+        original, deltas = readJournal(filepath)
+        if original is None:
+            raise ValueError("journal has no snapshot")
+    else:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            original = json.load(f)
+
+    # Validation : l'etat migre doit redonner un personnage, que l'on re-serialise tel que le jeu l'ecrirait
+    state = toPlainData(_deserialize_character(copy.deepcopy(original)))
+    state["version"] = SAVE_SCHEMA_VERSION
+    if state == original and not deltas:
+        return None
+
+    if filepath.endswith(JOURNAL_EXT):
+        record = {"snapshot": state, "saved_at": time.strftime('%Y-%m-%dT%H:%M:%S')}
+        return (json.dumps(record, separators=(',', ':'), ensure_ascii=False) + "\n").encode('utf-8')
+    return json.dumps(state, indent=4).encode('utf-8')
+
+
+def _migrate_binary(filepath: str) -> Optional[bytes]:
+    with open(filepath, 'rb') as f:
+        data = f.read()
+    character = decodeCharacter(data)
+    _, _, flags = HEADER.unpack_from(data, 0)
+    migrated = encodeCharacter(character, compress=bool(flags & FLAG_COMPRESSED))
+    return None if migrated == data else migrated
+
+
+def migrateFile(filepath: str, dry_run: bool = False) -> Tuple[str, str, str]:
+    """Validates and migrates one save. Returns (path, status, error) with status migrated, unchanged or failed."""
+    try:
+        data = _migrate_binary(filepath) if filepath.endswith(BINARY_EXT) else _migrate_text(filepath)
+        if data is None:
+            return filepath, "unchanged", ""
+        if not dry_run:
+            writeFileAtomic(filepath, data)
+        return filepath, "migrated", ""
+    except (OSError, ValueError, KeyError, TypeError, AttributeError, SaveFormatError) as e:
+        return filepath, "failed", f"{type(e).__name__}: {e}"
+
+
+def _migrate_batch(filepaths: List[str], dry_run: bool) -> List[Tuple[str, str, str]]:
+    return [migrateFile(filepath, dry_run) for filepath in filepaths]
+
+
+def _batches(filepaths: Iterator[str], size: int) -> Iterator[List[str]]:
+    batch = []
+    for filepath in filepaths:
+        batch.append(filepath)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def migrateDirectory(directory: str = SAVES_DIR, workers: int = None, batch_size: int = 64,
+                     dry_run: bool = False, progress_every: float = 1.0) -> dict:
+    """Migrates every save of a directory over a process pool and returns the counts per status and the failures."""
+    workers = workers or os.cpu_count()
+    counts = {"migrated": 0, "unchanged": 0, "failed": 0}
+    failures = []
+    start = last_report = time.perf_counter()
+
+    # Forked workers inherit the pending terminal buffer, empty it first
+    flush()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        batches = _batches(iterSaveFiles(directory), batch_size)
+        pending = set()
+        while True:
+            for batch in batches:
+                pending.add(executor.submit(_migrate_batch, batch, dry_run))
+                if len(pending) >= workers * BATCHES_IN_FLIGHT:
+                    break
+            if not pending:
+                break
+
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                for filepath, status, error in future.result():
+                    counts[status] += 1
+                    if error:
+                        failures.append((os.path.basename(filepath), error))
+
+            now = time.perf_counter()
+            if now - last_report >= progress_every:
+                processed = sum(counts.values())
+                write("{} saves processed ({:.0f}/s), {} failed", processed, processed / (now - start), counts["failed"])
+                flush()
+                last_report = now
+
+    return {"counts": counts, "failures": failures, "seconds": time.perf_counter() - start}
+
+
+def printSummary(report: dict, dry_run: bool = False) -> None:
+    counts = report["counts"]
+    verb = "would be migrated" if dry_run else "migrated"
+    write("\n{} saves in {:.1f}s: {} {}, {} unchanged, {} failed",
+          sum(counts.values()), report["seconds"], counts["migrated"], verb, counts["unchanged"], counts["failed"])
+    for filename, error in report["failures"][:MAX_REPORTED_FAILURES]:
+        write("  {}: {}", filename, error)
+    if len(report["failures"]) > MAX_REPORTED_FAILURES:
+        write("  ... and {} more", len(report["failures"]) - MAX_REPORTED_FAILURES)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate and migrate every save file to the current schema version.")
+    parser.add_argument("directory", nargs="?", default=SAVES_DIR, help="saves directory (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: one per CPU)")
+    parser.add_argument("--batch-size", type=int, default=64, help="files sent to a worker at once")
+    parser.add_argument("--dry-run", action="store_true", help="validate only, do not rewrite any file")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.directory):
+        parser.error(f"{args.directory} is not a directory")
+
+    report = migrateDirectory(args.directory, args.workers, args.batch_size, args.dry_run)
+    printSummary(report, args.dry_run)
+    flush()
+    exit(1 if report["counts"]["failed"] else 0)
+
+
+if __name__ == "__main__":
+    main()
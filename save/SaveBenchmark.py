@@ -0,0 +1,60 @@
+import json
+import time
+from entity.Character import Character, Warrior
+from inventory.Inventory import Inventory
+from item.ItemFactory import getItemFactory
+from save.BinaryCodec import encodeCharacter, decodeCharacter
+from SaveGame import serialize, toPlainData, _deserialize_character
+from Renderer import write, flush
+
+
+def buildSampleCharacter(level: int = 10) -> Character:
+    """A character with a full inventory of catalog items, the worst case for save size."""
+    factory = getItemFactory()
+    character = Warrior("Benchmark")
+    character.level = level
+
+    inventory = Inventory()
+    for item in factory.rollItems(Inventory.MAX_SLOTS, level):
+        inventory.restoreItem(item)
+    weapons = inventory.getWeapons()
+    armors = inventory.getArmors()
+    inventory.equipped_weapon = weapons[0] if weapons else None
+    inventory.equipped_armor = armors[0] if armors else None
+    character.inventory = inventory
+    return character
+
+
+def _time_load(load, data, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        load(data)
+    return (time.perf_counter() - start) / repeat
+
+
+def benchmarkFormats(character: Character, repeat: int = 2000) -> dict:
+    """Size in bytes and mean load time in microseconds of each save format."""
+    legacy = json.dumps(character, default=serialize, indent=4).encode('utf-8')
+    compact = json.dumps(toPlainData(character), separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    formats = {
+        "json (legacy)": (legacy, lambda data: _deserialize_character(json.loads(data))),
+        "json (journal snapshot)": (compact, lambda data: _deserialize_character(json.loads(data))),
+        "binary": (encodeCharacter(character), decodeCharacter),
+        "binary + zlib": (encodeCharacter(character, compress=True), decodeCharacter),
+    }
+
+    results = {}
+    for label, (data, load) in formats.items():
+        results[label] = {
+            "size": len(data),
+            "load_us": _time_load(load, data, repeat) * 1e6
+        }
+    return results
+
+
+if __name__ == "__main__":
+    results = benchmarkFormats(buildSampleCharacter())
+    write("{:<26}{:>8}{:>12}", "format", "bytes", "load (us)")
+    for label, result in results.items():
+        write("{:<26}{:>8}{:>12.1f}", label, result["size"], result["load_us"])
+    flush()
@@ -0,0 +1,101 @@
+import os
+import threading
+from typing import Dict, Optional, Tuple
+from entity.Character import Character
+from SaveGame import SaveGame, toPlainData
+from Renderer import write
+
+
+class SaveWriter:
+    """Writes saves on a background thread so the game never waits on the disk.
+
+    submit() only takes a plain-data snapshot of the character on the game
+    thread; the diff, encoding and atomic write happen on the worker. Saves
+    submitted for the same character before the worker picks them up are merged,
+    only the latest snapshot is written. With background=False saves are
+    written inline by submit(), e.g. to time them in a replay.
+    """
+
+    def __init__(self, save_game: SaveGame = None, background: bool = True):
+        self.save_game = save_game or SaveGame()
+        # (name, type) -> latest snapshot waiting to be written
+        self._pending: Dict[Tuple[str, str], dict] = {}
+        self._condition = threading.Condition()
+        self._writing = False
+        self._closed = False
+        self.last_error: Optional[Exception] = None
+        self.saves_written = 0
+        self.saves_coalesced = 0
+        self._thread = None
+        if background:
+            self._thread = threading.Thread(target=self._run, name="SaveWriter", daemon=True)
+            self._thread.start()
+
+    def submit(self, character: Character) -> str:
+        """Queues a save of the character and returns immediately."""
+        self._reportError()
+        state = toPlainData(character)
+        filepath = self.save_game.savePath(state["name"], state["type"])
+        key = (state["name"], state["type"])
+
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("SaveWriter is closed")
+            if key in self._pending:
+                self.saves_coalesced += 1
+            self._pending[key] = state
+            self._condition.notify()
+
+        write("Saving game: {}", os.path.basename(filepath))
+        if self._thread is None:
+            self._writeBatch(self._takeBatch())
+        return filepath
+
+    def flush(self) -> None:
+        """Blocks until every queued save is on disk."""
+        with self._condition:
+            while self._pending or self._writing:
+                self._condition.wait()
+        self._reportError()
+
+    def close(self) -> None:
+        self.flush()
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _reportError(self) -> None:
+        if self.last_error is not None:
+            write("Last save failed: {}", self.last_error)
+            self.last_error = None
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+                if not self._pending:
+                    return
+            self._writeBatch(self._takeBatch())
+
+    def _takeBatch(self) -> Dict[Tuple[str, str], dict]:
+        with self._condition:
+            batch, self._pending = self._pending, {}
+            self._writing = True
+        return batch
+
+    def _writeBatch(self, batch: Dict[Tuple[str, str], dict]) -> None:
+        try:
+            for state in batch.values():
+                try:
+                    self.save_game.writeState(state)
+                    self.saves_written += 1
+                # sqlite3.Error, struct.error... : le worker ne doit jamais mourir, sinon flush() attend pour toujours
+                except Exception as e:
+                    self.last_error = e
+        finally:
+            with self._condition:
+                self._writing = False
+                self._condition.notify_all()
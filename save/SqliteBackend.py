@@ -0,0 +1,180 @@
+import json
+import sqlite3
+import threading
+import time
+from typing import Iterable, List, Optional, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS characters (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    type TEXT NOT NULL,
+    level INTEGER NOT NULL,
+    xp INTEGER NOT NULL,
+    hp INTEGER NOT NULL,
+    hpMax INTEGER NOT NULL,
+    strength INTEGER NOT NULL,
+    defense INTEGER NOT NULL,
+    intelligence INTEGER NOT NULL,
+    agility INTEGER NOT NULL,
+    critChance INTEGER NOT NULL,
+    seed INTEGER,
+    weapon_slot INTEGER,
+    armor_slot INTEGER,
+    saved_at REAL NOT NULL,
+    UNIQUE (name, type)
+);
+CREATE INDEX IF NOT EXISTS idx_characters_saved_at ON characters (saved_at);
+CREATE INDEX IF NOT EXISTS idx_characters_name_saved_at ON characters (name, saved_at);
+CREATE INDEX IF NOT EXISTS idx_characters_level ON characters (level, xp);
+
+CREATE TABLE IF NOT EXISTS items (
+    character_id INTEGER NOT NULL REFERENCES characters (id) ON DELETE CASCADE,
+    slot INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    item_type TEXT NOT NULL,
+    minimal_level INTEGER NOT NULL,
+    modifier_type TEXT NOT NULL,
+    value INTEGER NOT NULL,
+    affected_stats TEXT NOT NULL,
+    apparition_rate INTEGER NOT NULL,
+    is_used INTEGER,
+    quantity INTEGER,
+    PRIMARY KEY (character_id, slot)
+) WITHOUT ROWID;
+"""
+
+STAT_COLUMNS = ("level", "xp", "hp", "hpMax", "strength", "defense", "intelligence", "agility", "critChance", "seed")
+ITEM_COLUMNS = ("name", "item_type", "minimal_level", "modifier_type", "value", "affected_stats", "apparition_rate", "is_used", "quantity")
+
+# Slots des objets equipes absents de la liste d'objets (anciennes sauvegardes JSON)
+WEAPON_SLOT = -1
+ARMOR_SLOT = -2
+
+UPSERT_CHARACTER = (
+    f"INSERT INTO characters (name, type, {', '.join(STAT_COLUMNS)}, weapon_slot, armor_slot, saved_at) "
+    f"VALUES ({', '.join('?' * (len(STAT_COLUMNS) + 5))}) "
+    f"ON CONFLICT (name, type) DO UPDATE SET "
+    + ", ".join(f"{column} = excluded.{column}" for column in STAT_COLUMNS + ("weapon_slot", "armor_slot", "saved_at"))
+)
+INSERT_ITEM = f"INSERT INTO items (character_id, slot, {', '.join(ITEM_COLUMNS)}) VALUES ({', '.join('?' * (len(ITEM_COLUMNS) + 2))})"
+SUMMARY_COLUMNS = "name, type, level, xp, saved_at AS timestamp"
+
+
+class SqliteSaveBackend:
+    """Stores characters and their items in a SQLite database.
+
+    Works on the plain-data states produced by SaveGame's toPlainData, so it
+    does not depend on the game classes. One connection is opened in WAL mode
+    and shared by the game and save writer threads behind a lock.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute("PRAGMA foreign_keys=ON")
+        self.connection.executescript(SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self.connection.close()
+
+    def writeState(self, state: dict, saved_at: float = None) -> None:
+        with self._lock, self.connection:
+            self._insertState(state, saved_at if saved_at is not None else time.time())
+
+    def importStates(self, states: Iterable[Tuple[dict, float]]) -> int:
+        """Bulk import of (state, saved_at) pairs in a single transaction, returns the number written."""
+        count = 0
+        with self._lock, self.connection:
+            for state, saved_at in states:
+                self._insertState(state, saved_at)
+                count += 1
+        return count
+
+    def _insertState(self, state: dict, saved_at: float) -> None:
+        inventory = state.get("inventory") or {}
+        rows = list(enumerate(inventory.get("items", [])))
+        items = [item for _, item in rows]
+
+        equipped_slots = []
+        for key, extra_slot in (("equipped_weapon", WEAPON_SLOT), ("equipped_armor", ARMOR_SLOT)):
+            equipped = inventory.get(key)
+            if not equipped:
+                equipped_slots.append(None)
+            elif equipped in items:
+                equipped_slots.append(items.index(equipped))
+            else:
+                rows.append((extra_slot, equipped))
+                equipped_slots.append(extra_slot)
+
+        self.connection.execute(
+            UPSERT_CHARACTER,
+            (state["name"], state["type"], *(state.get(column) for column in STAT_COLUMNS), *equipped_slots, saved_at)
+        )
+        (character_id,) = self.connection.execute(
+            "SELECT id FROM characters WHERE name = ? AND type = ?", (state["name"], state["type"])
+        ).fetchone()
+
+        self.connection.execute("DELETE FROM items WHERE character_id = ?", (character_id,))
+        self.connection.executemany(INSERT_ITEM, [
+            (character_id, slot, item["name"], item["item_type"], item["minimal_level"], item["modifier_type"],
+             item["value"], json.dumps(item["affected_stats"]), item["apparition_rate"],
+             item.get("is_used"), item.get("quantity"))
+            for slot, item in rows
+        ])
+
+    def loadState(self, name: str, char_type: str) -> Optional[dict]:
+        with self._lock:
+            character = self.connection.execute(
+                f"SELECT id, name, type, {', '.join(STAT_COLUMNS)}, weapon_slot, armor_slot FROM characters "
+                "WHERE name = ? AND type = ?", (name, char_type)
+            ).fetchone()
+            if character is None:
+                return None
+            item_rows = self.connection.execute(
+                f"SELECT slot, {', '.join(ITEM_COLUMNS)} FROM items WHERE character_id = ? ORDER BY slot",
+                (character["id"],)
+            ).fetchall()
+
+        slots = {}
+        for row in item_rows:
+            item = {column: row[column] for column in ITEM_COLUMNS if row[column] is not None}
+            item["affected_stats"] = json.loads(item["affected_stats"])
+            if "is_used" in item:
+                item["is_used"] = bool(item["is_used"])
+            slots[row["slot"]] = item
+
+        state = {column: character[column] for column in ("name", "type") + STAT_COLUMNS}
+        state["inventory"] = {
+            "items": [item for slot, item in slots.items() if slot >= 0],
+            "equipped_weapon": slots.get(character["weapon_slot"]),
+            "equipped_armor": slots.get(character["armor_slot"])
+        }
+        return state
+
+    def latest(self, count: int = 5, name: str = None) -> List[dict]:
+        """Newest saves first, optionally only those of one character name."""
+        with self._lock:
+            if name is None:
+                rows = self.connection.execute(
+                    f"SELECT {SUMMARY_COLUMNS} FROM characters ORDER BY saved_at DESC LIMIT ?", (count,)
+                ).fetchall()
+            else:
+                rows = self.connection.execute(
+                    f"SELECT {SUMMARY_COLUMNS} FROM characters WHERE name = ? ORDER BY saved_at DESC LIMIT ?",
+                    (name, count)
+                ).fetchall()
+        return [dict(row) for row in rows]
+
+    def leaderboard(self, count: int = 10) -> List[dict]:
+        """Highest level characters first, ties broken by experience."""
+        with self._lock:
+            rows = self.connection.execute(
+                f"SELECT {SUMMARY_COLUMNS} FROM characters ORDER BY level DESC, xp DESC LIMIT ?", (count,)
+            ).fetchall()
+        return [dict(row) for row in rows]
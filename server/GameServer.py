@@ -0,0 +1,203 @@
+import argparse
+import asyncio
+import json
+from typing import Callable, Dict, Optional
+from GameEngine import GameEngine, createEngine
+from CombatSimulator import CLASS_MAP
+from entity.EnemyFactory import POOL_SIZE, EnemyFactory
+from item.ItemFactory import getItemFactory
+from save.SaveWriter import SaveWriter
+from RngStream import RngStream
+from Renderer import CaptureSink, NullSink, useSink, write, flush
+
+DEFAULT_PORT = 4711
+# Des milliers de clients se connectent en meme temps au lancement d'un test de charge
+LISTEN_BACKLOG = 4096
+
+HELP = ("Commands: 'new <name> [Warrior|Mage|Thief] [seed]' starts a session, then send an action "
+        "or its menu number. 'state' returns the full state, 'actions' the menu, 'metrics' the server "
+        "counters, 'bye' disconnects.")
+
+
+class Session:
+    """One player: its engine, its own random stream and its captured output."""
+
+    def __init__(self, seed: int = None):
+        self.rng = RngStream(seed)
+        self.seed = self.rng.initial_seed
+        self.sink = CaptureSink()
+        self.engine: Optional[GameEngine] = None
+        self.steps = 0
+
+    def run(self, function: Callable, *args):
+        with useSink(self.sink):
+            return function(*args)
+
+    def takeOutput(self) -> str:
+        output = self.sink.text()
+        self.sink.clear()
+        return output
+
+
+class GameServer:
+    """Hosts independent game sessions over a JSON line protocol.
+
+    Requests are plain text lines (so telnet works), every response is one
+    JSON object per line with the session output, screen and menu.
+    """
+
+    def __init__(self, save_writer: SaveWriter = None):
+        # Toutes les sessions piochent dans le meme pool d'ennemis, ses compteurs sont dans metrics()
+        self.enemy_factory = EnemyFactory(pool_size=POOL_SIZE)
+        with useSink(NullSink()):
+            self.item_factory = getItemFactory()
+        # Un seul writer pour toutes les sessions, il fusionne les sauvegardes par personnage
+        self.save_writer = save_writer or SaveWriter()
+        self.sessions: Dict[int, Session] = {}
+        self.server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = DEFAULT_PORT) -> int:
+        self.server = await asyncio.start_server(self.handleClient, host, port, backlog=LISTEN_BACKLOG)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def serveForever(self) -> None:
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def close(self) -> None:
+        """Stops accepting clients and waits for every queued save to be written."""
+        self.server.close()
+        await self.server.wait_closed()
+        # close() attend le thread du writer, hors de la boucle asyncio
+        await asyncio.to_thread(self.save_writer.close)
+
+    def createSession(self, name: str, char_type: str = "Warrior", seed: int = None) -> Session:
+        if char_type not in CLASS_MAP:
+            raise ValueError(f"Unknown class '{char_type}'")
+        session = Session(seed)
+
+        def build():
+            engine = createEngine(CLASS_MAP[char_type](name), session.rng, self.enemy_factory,
+                                  self.item_factory, self.save_writer)
+            # quit ne doit pas bloquer la boucle : close() vide le writer pour toutes les sessions
+            engine.flush_on_quit = False
+            engine.start()
+            return engine
+
+        session.engine = session.run(build)
+        return session
+
+    def metrics(self) -> dict:
+        pool = self.enemy_factory.pool
+        return {
+            "sessions": len(self.sessions),
+            "enemy_pool": pool.stats() if pool is not None else None,
+            "saves_written": self.save_writer.saves_written,
+            "saves_coalesced": self.save_writer.saves_coalesced
+        }
+
+    def handleLine(self, session: Optional[Session], line: str):
+        """Runs one request and returns (session, response)."""
+        command, _, rest = line.partition(" ")
+
+        if command == "metrics":
+            return session, {"ok": True, "metrics": self.metrics()}
+
+        if command == "new":
+            args = rest.split()
+            if not args:
+                raise ValueError("Usage: new <name> [class] [seed]")
+            seed = int(args[2]) if len(args) > 2 else None
+            session = self.createSession(args[0], args[1] if len(args) > 1 else "Warrior", seed)
+            return session, self.response(session, seed=session.seed)
+
+        if session is None:
+            raise ValueError("No session, start one with 'new <name> [class] [seed]'")
+
+        if command == "state":
+            return session, self.response(session, state=session.engine.state())
+        if command == "actions":
+            return session, self.response(session)
+
+        action = line
+        if line.isdigit():
+            actions = session.engine.legalActions()
+            index = int(line)
+            if not 1 <= index <= len(actions):
+                raise ValueError(f"Choice must be between 1 and {len(actions)}")
+            action = actions[index - 1]
+
+        session.run(session.engine.step, action)
+        session.steps += 1
+        return session, self.response(session)
+
+    def response(self, session: Session, **extra) -> dict:
+        prompt, options = session.engine.menu()
+        response = {
+            "ok": True,
+            "output": session.takeOutput(),
+            "screen": session.engine.currentScreen,
+            "prompt": prompt,
+            "actions": options
+        }
+        response.update(extra)
+        return response
+
+    async def handleClient(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        session = None
+        writer.write((json.dumps({"ok": True, "output": HELP}) + "\n").encode())
+        try:
+            while True:
+                raw = await reader.readline()
+                if not raw:
+                    break
+                line = raw.decode("utf-8", errors="replace").strip()
+                if not line:
+                    continue
+                if line == "bye":
+                    break
+
+                try:
+                    previous = session
+                    session, response = self.handleLine(session, line)
+                    if session is not previous:
+                        self.sessions.pop(id(previous), None)
+                        self.sessions[id(session)] = session
+                except ValueError as e:
+                    response = {"ok": False, "error": str(e)}
+
+                writer.write((json.dumps(response, ensure_ascii=False) + "\n").encode("utf-8"))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            if session is not None:
+                self.sessions.pop(id(session), None)
+            writer.close()
+
+
+async def _serve(host: str, port: int) -> None:
+    server = GameServer()
+    port = await server.start(host, port)
+    write("Aetherfall server listening on {}:{}", host, port)
+    flush()
+    try:
+        await server.serveForever()
+    finally:
+        # Ctrl+C annule la tache : les sauvegardes en attente doivent quand meme finir
+        await server.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Aetherfall multi-session server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args()
+    try:
+        asyncio.run(_serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+import argparse
+import asyncio
+import json
+import random
+import tempfile
+import time
+from typing import List, Optional
+from server.GameServer import GameServer, DEFAULT_PORT
+from save.SaveWriter import SaveWriter
+from SaveGame import SaveGame
+from Renderer import write, flush
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def _request(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, line: str) -> dict:
+    writer.write((line + "\n").encode("utf-8"))
+    await writer.drain()
+    return json.loads(await reader.readline())
+
+
+async def runClient(host: str, port: int, index: int, actions: int, latencies: List[float], seed: int) -> int:
+    """One synthetic player picking random legal actions, returns the number of errors."""
+    rng = random.Random(seed + index)
+    reader, writer = await asyncio.open_connection(host, port)
+    errors = 0
+    try:
+        await reader.readline()
+        response = await _request(reader, writer, f"new Bot{index} {rng.choice(['Warrior', 'Mage', 'Thief'])} {seed + index}")
+        for _ in range(actions):
+            choices = [action for action, _ in response.get("actions", [])]
+            if not choices:
+                break
+
+            start = time.perf_counter()
+            response = await _request(reader, writer, rng.choice(choices))
+            latencies.append(time.perf_counter() - start)
+            if not response["ok"]:
+                errors += 1
+        writer.write(b"bye\n")
+        await writer.drain()
+    finally:
+        writer.close()
+    return errors
+
+
+async def loadTest(clients: int, actions: int, host: str = "127.0.0.1", port: Optional[int] = None, seed: int = 0) -> dict:
+    """Runs `clients` concurrent sessions of `actions` steps each.
+
+    Without a port an in-process server is started on a free port, so the
+    latencies also include the server work sharing the same event loop. Its
+    saves go to a temporary directory, not to the player's saves.
+    """
+    server = None
+    saves_dir = None
+    if port is None:
+        saves_dir = tempfile.TemporaryDirectory()
+        server = GameServer(SaveWriter(SaveGame(saves_dir=saves_dir.name)))
+        port = await server.start(host, 0)
+
+    latencies: List[float] = []
+    start = time.perf_counter()
+    errors = await asyncio.gather(*(runClient(host, port, i, actions, latencies, seed) for i in range(clients)))
+    elapsed = time.perf_counter() - start
+
+    metrics = None
+    if server is not None:
+        metrics = server.metrics()
+        await server.close()
+        saves_dir.cleanup()
+
+    return {
+        "clients": clients,
+        "actions": len(latencies),
+        "errors": sum(errors),
+        "seconds": elapsed,
+        "throughput": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "server": metrics
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Synthetic load test of the Aetherfall server.")
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--actions", type=int, default=100, help="actions per client")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=None,
+                        help=f"server to test (e.g. {DEFAULT_PORT}), default starts one in-process")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    report = asyncio.run(loadTest(args.clients, args.actions, args.host, args.port, args.seed))
+    write("{} clients, {} actions in {:.2f}s ({:.0f} actions/s), {} errors",
+          report["clients"], report["actions"], report["seconds"], report["throughput"], report["errors"])
+    write("latency p50 {:.2f} ms, p99 {:.2f} ms", report["p50_ms"], report["p99_ms"])
+    pool = report["server"] and report["server"]["enemy_pool"]
+    if pool:
+        write("enemy pool: {:.1%} hits ({} hits, {} misses)", pool["hit_rate"], pool["hits"], pool["misses"])
+    flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+import json
+import os
+import random
+from collections import OrderedDict, deque
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional
+from zone.ZoneState import ForestState, VillageState, ZoneState
+from Renderer import write
+
+if TYPE_CHECKING:
+    from entity.Character import Character
+
+WORLD_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "world.json")
+# Zones gardees en memoire, les moins recemment visitees sont recreees au besoin
+DEFAULT_CACHE_SIZE = 32
+NO_ROUTE = -1
+
+DEFAULT_WORLD = {
+    "start": "village",
+    "zones": [
+        {"id": "village", "name": "Village", "kind": "village", "connections": ["forest"]},
+        {"id": "forest", "name": "Forest", "kind": "forest", "connections": ["village"]}
+    ]
+}
+
+
+class WorldMap:
+    """The world map read from world.json: zone specs and precomputed routes.
+
+    A spec is a zone id, name, kind, connections and optionally the item
+    required to enter. Shortest routes between all zones are computed once
+    at load as a next-hop table, the map is then shared by every session.
+    """
+
+    def __init__(self, data: dict):
+        self.specs: List[dict] = data["zones"]
+        self.index: Dict[str, int] = {}
+        for i, spec in enumerate(self.specs):
+            if spec["id"] in self.index:
+                raise ValueError(f"Duplicate zone id '{spec['id']}'")
+            self.index[spec["id"]] = i
+
+        self.start = data.get("start", self.specs[0]["id"])
+        if self.start not in self.index:
+            raise ValueError(f"Unknown start zone '{self.start}'")
+        try:
+            self.neighbours: List[List[int]] = [[self.index[target] for target in spec["connections"]] for spec in self.specs]
+        except KeyError as e:
+            raise ValueError(f"Connection to unknown zone {e}") from None
+
+        self._next_hop = [self._routesFrom(source) for source in range(len(self.specs))]
+
+    def _routesFrom(self, source: int) -> List[int]:
+        """BFS from source: first zone to walk to for every destination (NO_ROUTE if unreachable)."""
+        next_hop = [NO_ROUTE] * len(self.specs)
+        next_hop[source] = source
+        queue = deque()
+        for neighbour in self.neighbours[source]:
+            if next_hop[neighbour] == NO_ROUTE:
+                next_hop[neighbour] = neighbour
+                queue.append(neighbour)
+        while queue:
+            current = queue.popleft()
+            hop = next_hop[current]
+            for neighbour in self.neighbours[current]:
+                if next_hop[neighbour] == NO_ROUTE:
+                    next_hop[neighbour] = hop
+                    queue.append(neighbour)
+        return next_hop
+
+    # --- Specs ---
+
+    def __len__(self) -> int:
+        return len(self.specs)
+
+    def spec(self, zone_id: str) -> dict:
+        return self.specs[self.index[zone_id]]
+
+    def connections(self, zone_id: str) -> List[str]:
+        return self.spec(zone_id)["connections"]
+
+    def canEnter(self, zone_id: str, character: "Character") -> bool:
+        required = self.spec(zone_id).get("requires")
+        return required is None or character.inventory.hasItemNamed(required)
+
+    # --- Routes ---
+
+    def isReachable(self, source: str, destination: str) -> bool:
+        return self._next_hop[self.index[source]][self.index[destination]] != NO_ROUTE
+
+    def route(self, source: str, destination: str) -> Optional[List[str]]:
+        """Zones to walk through from source to destination (both included), None if unreachable."""
+        current, target = self.index[source], self.index[destination]
+        if self._next_hop[current][target] == NO_ROUTE:
+            return None
+        path = [source]
+        while current != target:
+            current = self._next_hop[current][target]
+            path.append(self.specs[current]["id"])
+        return path
+
+    def unreachable(self) -> List[str]:
+        """Zones that cannot be reached from the start zone."""
+        start = self._next_hop[self.index[self.start]]
+        return [spec["id"] for spec, hop in zip(self.specs, start) if hop == NO_ROUTE]
+
+
+class ZoneGraph:
+    """The zones of one session, built on demand from a WorldMap.
+
+    A ZoneState and its strategy are created on the first visit and kept in
+    an LRU cache of cache_size zones; an evicted zone is simply built again
+    when the player comes back.
+    """
+
+    def __init__(self, world_map: WorldMap, builders: Dict[str, Callable[[dict], ZoneState]],
+                 cache_size: int = DEFAULT_CACHE_SIZE):
+        for spec in world_map.specs:
+            if spec["kind"] not in builders:
+                raise ValueError(f"Unknown kind '{spec['kind']}' for zone '{spec['id']}'")
+        self.map = world_map
+        self.builders = builders
+        self.cache_size = max(1, cache_size)
+        self._zones: "OrderedDict[str, ZoneState]" = OrderedDict()
+        self.zones_created = 0
+        self.zones_evicted = 0
+
+    @property
+    def start(self) -> str:
+        return self.map.start
+
+    def zone(self, zone_id: str) -> ZoneState:
+        """The zone object, built on first use and kept in the LRU cache."""
+        zone = self._zones.get(zone_id)
+        if zone is not None:
+            self._zones.move_to_end(zone_id)
+            return zone
+
+        spec = self.map.spec(zone_id)
+        zone = self.builders[spec["kind"]](spec)
+        zone.zone_id = zone_id
+        self.zones_created += 1
+        self._zones[zone_id] = zone
+        if len(self._zones) > self.cache_size:
+            self._zones.popitem(last=False)
+            self.zones_evicted += 1
+        return zone
+
+    def loadedZones(self) -> List[str]:
+        return list(self._zones)
+
+
+def loadWorldData(world_file: str = WORLD_FILE) -> dict:
+    try:
+        with open(world_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        write("File {} not found. Using the default world.", world_file)
+    except json.JSONDecodeError as e:
+        write("JSON parsing error: {}", e)
+    return DEFAULT_WORLD
+
+
+_world_maps: Dict[str, WorldMap] = {}
+
+
+def getWorldMap(world_file: str = WORLD_FILE) -> WorldMap:
+    """Shared WorldMap of a world file, loaded and routed once per process."""
+    world_map = _world_maps.get(world_file)
+    if world_map is None:
+        world_map = _world_maps[world_file] = WorldMap(loadWorldData(world_file))
+    return world_map
+
+
+def zoneBuilders(enemy_factory, item_factory=None, rng: random.Random = random) -> Dict[str, Callable[[dict], ZoneState]]:
+    """ZoneState constructor per zone kind of world.json."""
+    return {
+        "village": lambda spec: VillageState(spec["name"]),
+        "forest": lambda spec: ForestState(enemy_factory, item_factory, rng, spec["name"])
+    }
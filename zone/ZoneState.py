@@ -1,40 +1,43 @@
-import Game
+import random
+from typing import TYPE_CHECKING
 from zone.ZoneStrategy import ForestStrategy, VillageStrategy, ZoneStrategy
+from Renderer import write
+
+if TYPE_CHECKING:
+    from GameEngine import GameEngine
 
 class ZoneState():
     def __init__(self, name: str, strategy: ZoneStrategy):
         self.name = name
         self.strategy = strategy
-        self.connections = {}
-
-    def connect(self, key: str, zone: "ZoneState") -> None:
-        self.connections[key] = zone
+        # Identifiant dans world.json, donne par ZoneGraph
+        self.zone_id = name.lower()
     
-    def onEnter(self, game: "Game") -> None:
-        print(f"\nYou enter the {self.name}.")
+    def onEnter(self, game: "GameEngine") -> None:
+        write("\nYou enter the {}.", self.name)
         next_event = self.nextEvent(game)
         if next_event:
             next_event.execute(game)
 
-    def canEnter(self, game: "Game") -> bool:
+    def canEnter(self, game: "GameEngine") -> bool:
         return True
     
-    def nextEvent(self, game: "Game") -> None:
+    def nextEvent(self, game: "GameEngine") -> None:
         return self.strategy.nextEvent(game)
 
 class VillageState(ZoneState):
-    def __init__(self):
-        super().__init__(name="Village", strategy=VillageStrategy())
+    def __init__(self, name: str = "Village"):
+        super().__init__(name=name, strategy=VillageStrategy())
 
     @property
     def strat(self) -> VillageStrategy:
         return self.strategy
 
 class ForestState(ZoneState):
-    def __init__(self, enemy_factory):
-        super().__init__(name="Forest", strategy=ForestStrategy(enemy_factory))
+    def __init__(self, enemy_factory, item_factory=None, rng: random.Random = random, name: str = "Forest"):
+        super().__init__(name=name, strategy=ForestStrategy(enemy_factory, item_factory, rng))
 
-    def onEnter(self, game: "Game") -> None:
+    def onEnter(self, game: "GameEngine") -> None:
         super().onEnter(game)
         self.strategy.resetRun()
-        print("You enter in the forest")
\ No newline at end of file
+        write("You enter in the forest")
\ No newline at end of file
@@ -1,17 +1,26 @@
 from abc import ABC, abstractmethod
 import random
-from typing import Optional
+from typing import TYPE_CHECKING, List, Optional
 from entity.EnemyFactory import EnemyFactory
+from item.ItemFactory import ItemFactory, getItemFactory
 from EventCommand import ChestEvent, CombatEvent, DialogueEvent, Event, ShopEvent
-from Game import *
+from RngStream import RngStream
+from Renderer import write
+
+if TYPE_CHECKING:
+    from GameEngine import GameEngine
+
+FOREST_ENEMIES = ("Wolf", "Bandit", "Skeleton")
+KEY_ITEM = "Clé du donjon"
+KEY_DROP_CHANCE = 0.1
 
 class ZoneStrategy(ABC):
     @abstractmethod
-    def nextEvent(self, game: "Game") -> Optional[Event]:
+    def nextEvent(self, game: "GameEngine") -> Optional[Event]:
         pass
 
 class VillageStrategy(ZoneStrategy):
-    def nextEvent(self, game: "Game") -> Optional[Event]:
+    def nextEvent(self, game: "GameEngine") -> Optional[Event]:
         return None
 
     def talkToVillagers(self):
@@ -20,39 +29,82 @@ class VillageStrategy(ZoneStrategy):
     def merchantEvent(self):
         return ShopEvent()
 
+class ForestCard:
+    """One pre-rolled event of a forest run: a combat or a chest.
+
+    Everything random is drawn when the deck is built: the enemy type, the
+    roll of its level and the seed of the stream its combat (or the chest
+    loot) draws from. Only the enemy level waits for createEvent(), as it
+    follows the player's level at the time of the fight.
+    """
+
+    def __init__(self, kind: str, seed: int, enemy_type: str = None, level_roll: float = 0.0, key: bool = False):
+        self.kind = kind
+        self.seed = seed
+        self.enemy_type = enemy_type
+        self.level_roll = level_roll
+        self.key = key
+
+    def enemyLevel(self, player_level: int) -> int:
+        # Meme loi que randint(max(1, niveau - 1), niveau + 2)
+        low, high = max(1, player_level - 1), player_level + 2
+        return low + min(int(self.level_roll * (high - low + 1)), high - low)
+
+    def createEvent(self, player_level: int, enemy_factory: EnemyFactory, item_factory: ItemFactory) -> Event:
+        rng = RngStream(self.seed)
+        if self.kind == "combat":
+            enemy = enemy_factory.create_enemy(self.enemy_type, self.enemyLevel(player_level), rng)
+            return CombatEvent(enemy, rng)
+        return ChestEvent(KEY_ITEM if self.key else None, item_factory=item_factory, rng=rng)
+
+
+def buildForestRun(rng: random.Random = random) -> List[ForestCard]:
+    """Deals a whole forest run: 2-4 combats and 1-3 chests in shuffled order.
+
+    Drawing the next event uniformly among the remaining ones, as the forest
+    used to, gives a uniform permutation, which is what shuffle() deals. The
+    key rolls are made on the chests in that order, so the key still drops at
+    most once with KEY_DROP_CHANCE per chest. Runs can be dealt in bulk for
+    simulations and played later with ForestCard.createEvent().
+    """
+    kinds = ["combat"] * rng.randint(2, 4) + ["chest"] * rng.randint(1, 3)
+    rng.shuffle(kinds)
+
+    deck = []
+    key_can_drop = True
+    for kind in kinds:
+        if kind == "combat":
+            deck.append(ForestCard(kind, rng.getrandbits(63), rng.choice(FOREST_ENEMIES), rng.random()))
+        else:
+            key = key_can_drop and rng.random() < KEY_DROP_CHANCE
+            key_can_drop = key_can_drop and not key
+            deck.append(ForestCard(kind, rng.getrandbits(63), key=key))
+    return deck
+
+
 class ForestStrategy(ZoneStrategy):
-    def __init__(self, enemy_factory : EnemyFactory):
+    def __init__(self, enemy_factory : EnemyFactory, item_factory: ItemFactory = None, rng: random.Random = random):
         self.enemy_factory = enemy_factory
+        self.item_factory = item_factory or getItemFactory()
+        self.rng = rng
         self.resetRun()
     
     def resetRun(self):
-        self.remaining_combats = random.randint(2, 4)
-        self.remaining_chests = random.randint(1, 3)
-        self.key_can_drop = True
+        # Pioche par la fin : le premier evenement est en dernier
+        self.deck = buildForestRun(self.rng)
+        self.deck.reverse()
+    
+    @property
+    def remaining_combats(self) -> int:
+        return sum(card.kind == "combat" for card in self.deck)
     
-    def nextEvent(self, game: "Game") -> Optional[Event]:
-        if self.remaining_combats <= 0 and self.remaining_chests <= 0:
-            print("You have cleared the forest! Time to move on to the next zone.")            
+    @property
+    def remaining_chests(self) -> int:
+        return sum(card.kind == "chest" for card in self.deck)
+    
+    def nextEvent(self, game: "GameEngine") -> Optional[Event]:
+        if not self.deck:
+            write("You have cleared the forest! Time to move on to the next zone.")            
             return None
         
-        choices = []
-        if self.remaining_combats > 0:
-            choices.extend(["combat"] * self.remaining_combats)
-        if self.remaining_chests > 0:
-            choices.extend(["chest"] * self.remaining_chests)
-    
-        kind = random.choice(choices)
-        if kind == "combat":
-            self.remaining_combats -= 1
-            enemy_type = random.choice(["Wolf", "Bandit", "Skeleton"])
-            player_level = game.character.level
-            enemy_level = random.randint(max(1, player_level - 1), player_level + 2)
-            enemy = self.enemy_factory.create_enemy(enemy_type, enemy_level)
-            return CombatEvent(enemy)
-        else:
-            self.remaining_chests -= 1
-            if  self.key_can_drop and random.random() < 0.1:
-                self.key_can_drop = False
-                return ChestEvent(["Clé du donjon"])
-
-            return ChestEvent()
\ No newline at end of file
+        return self.deck.pop().createEvent(game.character.level, self.enemy_factory, self.item_factory)
\ No newline at end of file